@@ -16,9 +16,15 @@ from raven.conf import setup_logging
 from raven.handlers.logging import SentryHandler
 from raven_aiohttp import AioHttpTransport
 
+from src.discord.utils.deltasync import DeltaSync, BackendChangeFeed
+from src.discord.utils.errors import BackendUnavailable
 from src.discord.utils.iceteacontext import IceTeaContext
-from src.discord.utils.nextgen import Guild, User, Command, DiscordDto
+from src.discord.utils.nextgen import Guild, User, Command, DiscordDto, Tag
 from src.discord.utils.paginator import CannotPaginate
+from src.discord.utils.prefixes import PrefixMatcher
+from src.discord.utils.replay import MessageBuffer
+from src.discord.utils.snapshot import Snapshot
+from src.discord.utils.usersync import UserUploader
 
 
 class Iceteabot(commands.Bot):
@@ -39,6 +45,8 @@ class Iceteabot(commands.Bot):
         self.aioconnection = kwargs.get('aioconnection')  # type: ClientSession
         self.iceteacontext = None  # type: IceTeaContext
         self.prefix_func = self.get_guild_prefix
+        self.mention_prefixes = None  # type: typing.Optional[typing.Tuple[str, str]]
+        self.dm_prefixes = None  # type: typing.Optional[PrefixMatcher]
         self.data_base_built = False
         self.wait_for_database = asyncio.Event(loop=self.loop)
         self.guild_commands_used = {}  # type: typing.Dict[int,typing.Counter]
@@ -49,6 +57,9 @@ class Iceteabot(commands.Bot):
         self.error_logger = kwargs.get("error_logger")  # type: logging.Logger
         self.add_check(self.guild_black_list)
         self.dto = DiscordDto(self)
+        self.snapshot = Snapshot(self)
+        self.delta_sync = None  # type: typing.Optional[DeltaSync]
+        self.message_buffer = MessageBuffer(self.config.get("message_replay_age"))
         self.fetch_data = self.dto.fetch_data
         self.reminder_task = self.loop.create_task(self.dto.get_all_reminders())  # type: asyncio.Task
 
@@ -61,13 +72,71 @@ class Iceteabot(commands.Bot):
         self.reminder_task.cancel()
         self.sentry_handler.close()
         await self.dto.cancel_reminders()
+        if self.delta_sync is not None:
+            self.delta_sync.stop()
+        await self.snapshot.close()
+        await self.dto.close()
+        Tag.CONTENT_STORE.close()
         await super().close()
 
+    def is_guild_ready(self, guild: typing.Optional[discord.Guild]) -> bool:
+        """Guilds can serve commands as soon as their own data has loaded, DMs wait for the whole sync"""
+        if guild is None:
+            return self.data_base_built
+        return guild.id in self.guild_data
+
+    def mark_guild_ready(self, guild_data: Guild):
+        self.guild_data[guild_data.guild] = guild_data
+        self.guild_commands_used.setdefault(guild_data.guild, Counter())
+        if self.message_buffer.should_drain(guild_data.guild):
+            self.loop.create_task(self.replay_messages(guild_data.guild))
+
+    async def replay_messages(self, key: typing.Optional[int]):
+        """Runs the commands sent to a guild (``None`` for DMs) while it was loading, in the order they came in"""
+        for message in self.message_buffer.drain(key):
+            try:
+                await self.process_message(message)
+            except Exception:
+                self.error_logger.exception(f"Replaying message {message.id} failed")
+
+    async def evict_idle_guilds(self):
+        """Periodically packs the sub-collections of guilds nobody has used lately back into compact records"""
+        while not self.is_closed():
+            await asyncio.sleep(Guild.IDLE_EVICTION)
+            evicted = sum(guild.evict_idle() for guild in list(self.guild_data.values()))
+            if evicted:
+                self.logger.info(f"Compacted {evicted} idle guild collections")
+            await Tag.CONTENT_STORE.sweep()
+
+    async def warm_start(self) -> int:
+        """Serves guilds straight from the local snapshot until the backend sync replaces them"""
+        document = await self.snapshot.load()
+        if document is None:
+            return 0
+        loaded = 0
+        for payload in document['guilds']:
+            if self.get_guild(payload.get("guild")) is not None:
+                self.mark_guild_ready(Guild(self.dto, **payload))
+                loaded += 1
+        self.command_data = {payload['name']: Command(self.dto, **payload) for payload in document['commands']}
+        return loaded
+
     async def on_message(self, message):
-        if all((self.data_base_built, not message.author.bot, message.webhook_id is None)):
-            ctx = await self.get_context(message, cls=IceTeaContext)
-            if ctx.valid:
-                await self.invoke(ctx)
+        if message.author.bot or message.webhook_id is not None:
+            return
+        key = message.guild.id if message.guild is not None else None
+        if key in self.message_buffer:
+            # Still replaying what came in during warm-up, queue behind it
+            self.message_buffer.add(key, message, check=not self.is_guild_ready(message.guild))
+        elif self.is_guild_ready(message.guild):
+            await self.process_message(message)
+        else:
+            self.message_buffer.add(key, message)
+
+    async def process_message(self, message):
+        ctx = await self.get_context(message, cls=IceTeaContext)
+        if ctx.valid:
+            await self.invoke(ctx)
 
     async def on_error(self, event_method, *args, **kwargs):
         self.error_logger.error(f"{event_method} Raised an error", exc_info=True)
@@ -84,6 +153,8 @@ class Iceteabot(commands.Bot):
             KeyError,
             CannotPaginate
         )
+        if isinstance(getattr(error, "original", None), BackendUnavailable):
+            return
         if not isinstance(error, ignored_errors):
             self.error_logger.error(error, exc_info=True)
 
@@ -98,70 +169,85 @@ class Iceteabot(commands.Bot):
             full_url = f"{self.base_url}{url}"
         else:
             full_url = base_url
-        async with ClientSession(loop=self.loop,
-                                 headers={"Authorization": f"Token {self.config['api_keys']['iceteacity']}"}
-                                 ) as session:
-            async with session.post(json=data, url=full_url) as response:
-                if response.status in [200, 201, 204]:
-                    response_data = await response.json()
-                    return response_data
+        status, response_data = await self.dto.request("POST", full_url, json=data)
+        if status in [200, 201, 204]:
+            return response_data
 
     async def load_all_command_settings(self):
         print("Updating command settings........", end="")
         command_data = await self.fetch_data("commands")
         self.command_data = {command['name']: Command(self.dto, **command) for command in command_data}
-        for command in self.commands:
-            if command.qualified_name not in self.command_data and command.name not in \
-                    self.command_data:
-                if isinstance(command, commands.Group):
-                    parent = Command(self.dto, name=command.qualified_name, documentation=command.help,
-                                     aliases=",".join(command.aliases),
-                                     cog=command.cog_name)
-                    await parent.save()
-                    self.command_data[command.qualified_name] = parent
-                    for subcommand in command.walk_commands():
-                        if subcommand.qualified_name not in self.command_data:
-                            sub = Command(self.dto, name=subcommand.qualified_name, documentation=subcommand.help,
-                                          aliases=",".join(subcommand.aliases),
-                                          cog=subcommand.cog_name)
-                            await sub.save()
-                            self.command_data[subcommand.qualified_name] = sub
-                else:
-                    root = Command(self.dto, name=command.name, documentation=command.help,
-                                   aliases=",".join(command.aliases),
-                                   cog=command.cog_name)
-                    await root.save()
-                    self.command_data[command.qualified_name] = root
+        pending = []
+        for command in self.walk_commands():
+            local = Command(self.dto, name=command.qualified_name, documentation=command.help,
+                            aliases=",".join(command.aliases), cog=command.cog_name)
+            stored = self.command_data.get(command.qualified_name)
+            if stored is None:
+                self.command_data[command.qualified_name] = local
+                pending.append(local)
+            elif stored.content_hash != local.content_hash:
+                for field in Command.METADATA_FIELDS:
+                    if getattr(stored, field, None) != getattr(local, field, None):
+                        setattr(stored, field, getattr(local, field, None))
+                pending.append(stored)
+        if pending:
+            written = await self.dto.bulk_upsert(pending, Command.purl(self.base_url))
+            self.logger.info(f"Command settings written : {written}/{len(pending)}")
         print("Finished")
 
     @staticmethod
-    async def get_guild_prefix(iceteabot, message):
+    def get_guild_prefix(iceteabot, message) -> typing.List[str]:
+        """Runs on every message, so only the prefix the message starts with is handed back to discord.py"""
+        if iceteabot.mention_prefixes is None:
+            iceteabot.mention_prefixes = (f"<@{iceteabot.user.id}> ", f"<@!{iceteabot.user.id}> ")
         if message.guild is None:
-            return commands.when_mentioned_or(*iceteabot.config['default_prefix'])(iceteabot, message)
-        else:
-            guild_data: Guild = iceteabot.guild_data.get(message.guild.id)
-            if guild_data.prefixes:
-                return commands.when_mentioned_or(*guild_data.prefixes.keys())(iceteabot, message)
-            else:
-                return commands.when_mentioned(iceteabot, message)
+            if iceteabot.dm_prefixes is None:
+                default = iceteabot.config['default_prefix']
+                iceteabot.dm_prefixes = PrefixMatcher([default] if isinstance(default, str) else default,
+                                                      iceteabot.mention_prefixes)
+            return iceteabot.dm_prefixes.match(message.content)
+        guild_data: Guild = iceteabot.guild_data.get(message.guild.id)
+        if guild_data is None:
+            return list(iceteabot.mention_prefixes)
+        return guild_data.prefix_matcher(iceteabot.mention_prefixes).match(message.content)
 
     async def sync_database(self):
         await self.wait_until_ready()
         print("Syncing Database after login.....", end="", flush=True)
-        user_chunks = [self.users[i:i + 2000] for i in range(0, len(self.users), 2000)]
-        for chunk in user_chunks:
-            response = await self.post_data({"data": [{"id": user.id} for user in chunk]}, "users")
-            self.logger.info(f"Chunk created : {response}")
-        for guild in self.guilds:
-            guild: discord.Guild = guild
-            self.guild_data[guild.id] = await self.dto.get(Guild, guild=guild.id, create=True)
-            self.guild_commands_used[guild.id] = Counter()
+        sync_started = datetime.utcnow()
+        guild_ids = [guild.id for guild in self.guilds]
+        warm = await self.warm_start()
+        if warm:
+            self.logger.info(f"Serving {warm}/{len(guild_ids)} guilds from the local snapshot")
+        loaded = 0
+        async for guild_data in self.dto.hydrate_guilds(guild_ids, bulk=self.config.get("bulk_guild_sync", False)):
+            current = self.guild_data.get(guild_data.guild)
+            # A snapshot copy with edits still waiting to be written is newer than what the backend returned, and
+            # the write behind PATCHes absolute counters, so swapping it out could lose edits or rewind counts
+            if current is not None and current.has_local_edits():
+                current.merge(guild_data)
+            else:
+                self.mark_guild_ready(guild_data)
+            loaded += 1
+            if loaded % 100 == 0 or loaded == len(guild_ids):
+                self.logger.info(f"Loaded {loaded}/{len(guild_ids)} guilds")
+        uploader = UserUploader(self.dto, compress=self.config.get("gzip_uploads", False))
+        await uploader.upload(self.users)
+        self.logger.info(f"Users uploaded : {uploader.uploaded}, already synced : {uploader.skipped}, "
+                         f"failed : {uploader.failed}")
         await self.load_all_command_settings()
         application_info = await self.application_info()
         self.owner = application_info.owner
         self.client_id = application_info.id
         self.data_base_built = True
         self.wait_for_database.set()
+        if self.message_buffer.should_drain(None):
+            self.loop.create_task(self.replay_messages(None))
+        self.snapshot.start()
+        self.loop.create_task(self.evict_idle_guilds())
+        if self.config.get("delta_sync", False):
+            self.delta_sync = DeltaSync(self, BackendChangeFeed(self.dto), since=sync_started)
+            self.delta_sync.start()
         await self.change_presence(status=discord.Status.online, activity=discord.Game(name="waiting for orders"))
 
         print("Finished")
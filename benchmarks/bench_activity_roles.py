@@ -0,0 +1,129 @@
+"""Times one activity role reconciliation sweep of a large guild against the passive task it replaced
+
+Run from the repository root with ``python -m benchmarks.bench_activity_roles``.
+"""
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+import discord
+
+from src.discord.utils.activityroles import ActivityRoleEngine, ActivityRoles
+
+
+class Role:
+    """Compares like discord.Role, on class and id"""
+    __slots__ = ("id",)
+
+    def __init__(self, role_id: int):
+        self.id = role_id
+
+    def __eq__(self, other):
+        return isinstance(other, Role) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class PreviousActivity:
+    """nextgen.Activity as the passive task used it"""
+
+    def __init__(self, bot, guild: int, status: str, role: int):
+        self.bot, self.guild, self.status, self.role = bot, guild, status, role
+
+    def get_role(self):
+        return discord.utils.get(self.bot.get_guild(self.guild).roles, id=self.role)
+
+
+class PreviousGuildData:
+    premium = True
+
+    def __init__(self, activities):
+        self.activities = activities
+
+    @property
+    def activity_roles(self):
+        return [activity.get_role() for activity in self.activities.values()]
+
+
+async def previous_passive_task(bot):
+    """Activity._passive_task before the engine, verbatim apart from taking ``bot`` as an argument"""
+    for guild in bot.guilds:
+        guild_data = bot.get_guild_data(guild.id)
+        if guild_data.premium:
+            for member in guild.members:
+                if member.activity:
+                    activity = guild_data.activities.get(member.activity.name.lower())
+                    if activity:
+                        bot.dispatch("member_activity_update", member, activity.get_role(), True)
+                    else:
+                        all_roles = guild_data.activity_roles
+                        for role in member.roles:
+                            if role in all_roles:
+                                bot.dispatch("member_activity_update", member, role, False)
+                else:
+                    all_roles = guild_data.activity_roles
+                    for role in member.roles:
+                        if role in all_roles:
+                            bot.dispatch("member_activity_update", member, role, False)
+
+
+def main(members: int = 20000, roles: int = 250, activities: int = 40):
+    rng = random.Random(0)
+    guild = SimpleNamespace(id=1, roles=[Role(role_id) for role_id in range(1, roles + 1)])
+    by_id = {role.id: role for role in guild.roles}
+    guild.get_role = by_id.get
+    games = [f"Game {index}" for index in range(activities)]
+    tracked = dict(zip((game.lower() for game in games), rng.sample(range(1, roles + 1), activities)))
+    guild.members = []
+    for _ in range(members):
+        playing = rng.choice(games + [None] * activities)
+        held = rng.sample(guild.roles, rng.randint(0, 6))
+        guild.members.append(SimpleNamespace(guild=guild, roles=held,
+                                             activity=SimpleNamespace(name=playing) if playing else None))
+
+    previous_events, engine_events = [], []
+    previous_bot = SimpleNamespace(guilds=[guild], get_guild=lambda guild_id: guild,
+                                   dispatch=lambda *event: previous_events.append(event))
+    previous_data = PreviousGuildData({status: PreviousActivity(previous_bot, 1, status, role)
+                                       for status, role in tracked.items()})
+    previous_bot.get_guild_data = lambda guild_id: previous_data
+    bot = SimpleNamespace(guilds=[guild], dispatch=lambda *event: engine_events.append(event),
+                          guild_data={1: SimpleNamespace(premium=True,
+                                                         activity_map=ActivityRoles(tracked, tracked.values()))})
+    engine = ActivityRoleEngine(bot)
+
+    loop = asyncio.new_event_loop()
+    try:
+        began = time.perf_counter()
+        loop.run_until_complete(previous_passive_task(previous_bot))
+        previous = time.perf_counter() - began
+        began = time.perf_counter()
+        loop.run_until_complete(engine.reconcile())
+        new = time.perf_counter() - began
+    finally:
+        loop.close()
+
+    # What each member needs: its activity's role if missing, and any other activity role it holds removed
+    expected = set()
+    for member in guild.members:
+        wanted = tracked.get(member.activity.name.lower()) if member.activity else None
+        held = {role.id for role in member.roles if role.id in tracked.values()}
+        if wanted is not None and wanted not in held:
+            expected.add((id(member), wanted, True))
+        expected.update((id(member), role_id, False) for role_id in held - {wanted})
+    changes = {(id(member), role.id, adding) for _, member, role, adding in engine_events}
+    assert len(changes) == len(engine_events) and changes == expected
+    previous_removals = {(id(member), role.id, adding) for _, member, role, adding in previous_events if not adding}
+    assert previous_removals <= expected
+
+    print(f"{members} members, {roles} roles, {activities} tracked activities")
+    print(f"   passive task: {previous * 1e3:.0f}ms per sweep, every 10s, {len(previous_events)} dispatches")
+    print(f"   engine sweep: {new * 1e3:.0f}ms per sweep, every {ActivityRoleEngine.RECONCILE_INTERVAL}s, "
+          f"{len(engine_events)} dispatches, yielding every {ActivityRoleEngine.SLICE * 1e3:.0f}ms")
+    assert new < previous
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Times parse_date against plain dateutil over the timestamps of a realistic tag and reminder payload
+
+Run from the repository root with ``python -m benchmarks.bench_dates``.
+"""
+import datetime
+import timeit
+
+import dateutil.parser
+
+from src.discord.utils.nextgen import parse_date
+
+
+def stamps() -> list:
+    now = datetime.datetime(2018, 5, 1, 12, 30, 45, 123456)
+    tags = [{"created": (now - datetime.timedelta(days=i, seconds=i * 7)).isoformat() + "Z",
+             "edited": (now - datetime.timedelta(hours=i)).isoformat() + "Z" if i % 3 else None}
+            for i in range(2000)]
+    reminders = [{"timestamp": (now - datetime.timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                  "delta": (now + datetime.timedelta(hours=i)).isoformat() + "+00:00",
+                  "expires": (now + datetime.timedelta(days=i)).strftime("%Y-%m-%d")}
+                 for i in range(500)]
+    return [value for record in tags + reminders for value in record.values() if value]
+
+
+def main(number: int = 20):
+    values = stamps()
+    # The fast path has to agree with dateutil on every stamp or the timings mean nothing
+    for stamp in values:
+        assert parse_date(stamp) == dateutil.parser.parse(stamp).replace(tzinfo=None), stamp
+    timings = {}
+    for name, parser in (("dateutil", dateutil.parser.parse), ("parse_date", parse_date)):
+        timings[name] = timeit.timeit(lambda: [parser(stamp) for stamp in values], number=number)
+        print(f"{name:>10}: {timings[name] / number / len(values) * 1e6:.2f}us per timestamp "
+              f"over {len(values)} stamps")
+    assert timings["parse_date"] < timings["dateutil"]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Appends timers to the journal, forgets half of them, then replays and compacts the log
+
+Run from the repository root with ``python -m benchmarks.bench_journal``.
+"""
+import os
+import tempfile
+import time
+
+from src.discord.utils.journal import TimerJournal
+
+
+def main(timers: int = 20000):
+    path = os.path.join(tempfile.mkdtemp(), "timers.journal")
+    journal = TimerJournal(path=path)
+    journal.replay()
+    data = {"message": "x" * 40, "delta": "2018-01-01T00:00:00", "channel": 1, "event": "reminder_complete"}
+    try:
+        began = time.perf_counter()
+        for _ in range(timers):
+            journal.record("reminder", journal.next_id(), data)
+        for timer_id in range(-1, -timers, -2):
+            journal.forget("reminder", timer_id)
+        journal.close()
+        appending = time.perf_counter() - began
+        size = os.path.getsize(path)
+
+        began = time.perf_counter()
+        replayed = TimerJournal(path=path)
+        pending = replayed.replay()
+        replaying = time.perf_counter() - began
+        replayed.close()
+        assert sorted(timer_id for _, timer_id, _ in pending) == list(range(-timers, 0, 2))
+        assert os.path.getsize(path) < size
+        # Without a loop to sync on a timer, the journal only fsyncs full batches and on close
+        assert journal.fsyncs <= journal.appended // TimerJournal.FSYNC_BATCH + 1
+        print(f"{journal.appended} records appended in {appending:.2f}s "
+              f"({appending / journal.appended * 1e6:.1f}us each, {journal.fsyncs} fsyncs)")
+        print(f"replayed {len(pending)} pending timers in {replaying:.2f}s, "
+              f"log compacted from {size} to {os.path.getsize(path)} bytes")
+    finally:
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+
+if __name__ == '__main__':
+    main()
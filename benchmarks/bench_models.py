@@ -0,0 +1,128 @@
+"""Times the generated model loaders and serialisers against the kwargs.pop / __slots__ reflection they replaced
+
+Run from the repository root with ``python -m benchmarks.bench_models``.
+
+The reflective baselines are copies of the old constructors on the dirty tracking ``__setattr__`` they ran under,
+which every field assignment paid. The same constructors on a plain class are timed too, as the floor a loader that
+skips ``__setattr__`` can reach. The old Tag is ported onto the shared content store so all sides do the same work
+per row.
+"""
+import timeit
+
+from src.discord.utils.nextgen import Prefix, Tag, parse_date
+
+
+class Tracked:
+    """The dirty tracking base models had before their loaders were generated"""
+
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        if not key.startswith("_") and key in self.__slots__:
+            try:
+                object.__getattribute__(self, "_dto")
+            except AttributeError:
+                return
+            self.__dict__.setdefault("_dirty", set()).add(key)
+
+
+class ReflectiveTag:
+    __slots__ = (
+        "id", "author", "title", "_content", "created", "edited", "orphaned", "previous_author", "guild", "count",
+        "_dto")
+
+    def __init__(self, dto, **kwargs):
+        self.id = kwargs.pop('id', None)
+        self.author = kwargs.pop('discord_id', kwargs.pop("author", None))
+        self.title = kwargs.pop('title', None)
+        self._content = Tag.CONTENT_STORE.put(kwargs.pop('content', None))
+        self.created = parse_date(kwargs.pop("created", None))
+        self.edited = parse_date(kwargs.pop("edited", None))
+        self.orphaned = kwargs.pop("orphaned", None)
+        self.previous_author = kwargs.pop("previous_author", None)
+        self.guild = kwargs.pop('guild', None)
+        self.count = kwargs.pop('count', 0)
+        self._dto = dto
+
+    @property
+    def content(self):
+        return Tag.CONTENT_STORE.read(self._content)
+
+    @property
+    def data(self) -> dict:
+        response_data = {}
+        for attr in self.__slots__:
+            if attr == "_content":
+                attr = "content"
+            elif attr.startswith("_"):
+                continue
+            data = getattr(self, attr, None)
+            if data:
+                response_data[attr] = data
+        return response_data
+
+
+class ReflectivePrefix:
+    __slots__ = ("id", "guild", "prefix", "author", "uses", "created", "_dto")
+
+    def __init__(self, dto, **kwargs):
+        self.id = kwargs.pop('id', None)
+        self.guild = kwargs.pop('guild', None)
+        self.prefix = kwargs.pop('prefix', None)
+        self.author = kwargs.pop('discord_id', kwargs.pop("author", None))
+        self.uses = kwargs.pop("uses", 0)
+        self.created = parse_date(kwargs.pop('created', None))
+        self._dto = dto
+
+    @property
+    def data(self) -> dict:
+        response_data = {}
+        for attr in self.__slots__:
+            if not attr.startswith("_"):
+                data = getattr(self, attr, None)
+                if data:
+                    response_data[attr] = data
+        return response_data
+
+
+TAG = {"id": 4021, "discord_id": 92730223316959232, "title": "rules", "content": "Be nice " * 20,
+       "created": "2018-05-01T12:30:45.123456Z", "edited": None, "orphaned": False,
+       "guild": 92730839854493696, "count": 42}
+PREFIX = {"id": 311, "guild": 92730839854493696, "prefix": "!", "discord_id": 92730223316959232, "uses": 7,
+          "created": "2018-05-01T12:30:45.123456Z"}
+
+
+class TrackedTag(Tracked):
+    __slots__ = ReflectiveTag.__slots__
+    __init__ = ReflectiveTag.__init__
+    content = ReflectiveTag.content
+    data = ReflectiveTag.data
+
+
+class TrackedPrefix(Tracked):
+    __slots__ = ReflectivePrefix.__slots__
+    __init__ = ReflectivePrefix.__init__
+    data = ReflectivePrefix.data
+
+
+def best(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=7)) / number
+
+
+def main(number: int = 20000):
+    for label, payload, models in (("Tag", TAG, (TrackedTag, ReflectiveTag, Tag)),
+                                   ("Prefix", PREFIX, (TrackedPrefix, ReflectivePrefix, Prefix))):
+        # Every side must produce the same payload or the timings compare different work
+        datas = [model(None, **payload).data for model in models]
+        assert datas[0] == datas[1] == datas[2], datas
+        timings = {}
+        for name, model in zip(("reflective", "untracked", "generated"), models):
+            obj = model(None, **payload)
+            timings[name] = (best(lambda: model(None, **payload), number), best(lambda: obj.data, number))
+            print(f"{label:>6} {name:>10}: construct {timings[name][0] * 1e6:.2f}us  "
+                  f"data {timings[name][1] * 1e6:.2f}us")
+        assert timings["generated"][0] < timings["reflective"][0]
+        assert timings["generated"][1] < timings["reflective"][1]
+
+
+if __name__ == '__main__':
+    main()
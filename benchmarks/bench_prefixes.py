@@ -0,0 +1,70 @@
+"""Replays a message stream through the prefix trie and through a fresh ``when_mentioned_or`` list per message
+
+Run from the repository root with ``python -m benchmarks.bench_prefixes``.
+"""
+import random
+import string
+import timeit
+
+from src.discord.utils.prefixes import PrefixMatcher
+
+MENTIONS = ("<@123456789012345678> ", "<@!123456789012345678> ")
+POOL = ["!", "?", ".", "-", ";;", "!!", "t!", "ice ", ">", "$", "%", "tea."]
+
+
+def when_mentioned_or(*prefixes):
+    # What commands.when_mentioned_or builds on every call
+    def inner(bot, message):
+        return [f"<@{bot}> ", f"<@!{bot}> "] + list(prefixes)
+    return inner
+
+
+def main(guilds: int = 200, messages: int = 200000):
+    rng = random.Random(0)
+    guild_prefixes = [rng.sample(POOL, rng.randint(1, 4)) for _ in range(guilds)]
+
+    def content(prefixes):
+        roll = rng.random()
+        text = "".join(rng.choice(string.ascii_lowercase + " ") for _ in range(rng.randint(5, 60)))
+        if roll < 0.05:
+            return rng.choice(prefixes) + text
+        if roll < 0.06:
+            return rng.choice(MENTIONS) + text
+        return text
+
+    stream = []
+    for _ in range(messages):
+        prefixes = guild_prefixes[rng.randrange(guilds)]
+        stream.append((prefixes, content(prefixes)))
+    matchers = {id(prefixes): PrefixMatcher(prefixes, MENTIONS) for prefixes in guild_prefixes}
+
+    def old_path():
+        return [next((prefix for prefix in when_mentioned_or(*prefixes)("123456789012345678", text)
+                      if text.startswith(prefix)), None) for prefixes, text in stream]
+
+    def new_path():
+        found = []
+        for prefixes, text in stream:
+            prefix = matchers[id(prefixes)].match(text)[0]
+            found.append(prefix if text.startswith(prefix) else None)
+        return found
+
+    old_found, new_found = old_path(), new_path()
+    # The trie hands back the longest prefix, the list the first one listed, so only compare whether one matched
+    assert [prefix is None for prefix in old_found] == [prefix is None for prefix in new_found]
+    for (prefixes, text), prefix in zip(stream, new_found):
+        if prefix is not None:
+            assert len(prefix) == max(len(other) for other in list(prefixes) + list(MENTIONS)
+                                      if text.startswith(other))
+
+    old = timeit.timeit(old_path, number=1)
+    new = timeit.timeit(new_path, number=1)
+    matched = sum(prefix is not None for prefix in new_found)
+    print(f"{messages} messages over {guilds} guilds, {matched} starting with a prefix")
+    print(f"   when_mentioned_or: {old / messages * 1e6:.2f}us per message")
+    print(f"   prefix trie:       {new / messages * 1e6:.2f}us per message ({old / new:.1f}x)")
+    assert new < old
+
+
+if __name__ == '__main__':
+    main()
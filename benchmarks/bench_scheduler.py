@@ -0,0 +1,58 @@
+"""Schedules 100k reminders against a fake clock, reloads and cancels some, then fires the rest in due order
+
+Run from the repository root with ``python -m benchmarks.bench_scheduler``.
+"""
+import datetime
+import random
+import time
+
+from src.discord.utils.scheduler import TimerScheduler
+
+
+def main(pending: int = 100000, cancel_ratio: float = 0.1):
+    rng = random.Random(0)
+    start = datetime.datetime(2018, 1, 1)
+    now = [start]
+    scheduler = TimerScheduler(clock=lambda: now[0])
+    fired = []
+
+    def timer(key, when):
+        return lambda: fired.append((when, key))
+
+    began = time.perf_counter()
+    for key in range(pending):
+        when = start + datetime.timedelta(seconds=rng.randint(1, 30 * 86400))
+        scheduler.schedule(key, when, timer(key, when))
+    scheduling = time.perf_counter() - began
+    # Reloading the same timers from the backend must not duplicate them
+    for key in range(0, pending, 7):
+        scheduler.schedule(key, scheduler.when(key), timer(key, scheduler.when(key)))
+    assert len(scheduler) == pending
+    cancelled = set(rng.sample(range(pending), int(pending * cancel_ratio)))
+    began = time.perf_counter()
+    for key in cancelled:
+        scheduler.cancel(key)
+    cancelling = time.perf_counter() - began
+
+    began = time.perf_counter()
+    ticks = 0
+    while scheduler:
+        now[0] += datetime.timedelta(hours=1)
+        for callback in scheduler.pop_due():
+            callback()
+        ticks += 1
+    firing = time.perf_counter() - began
+
+    keys = [key for _, key in fired]
+    assert len(keys) == len(set(keys)) == pending - len(cancelled)
+    assert not cancelled.intersection(keys)
+    assert all(earlier[0] <= later[0] for earlier, later in zip(fired, fired[1:]))
+    # Popping is O(log n) per timer, a linear scan per tick would cost milliseconds each
+    assert firing / len(fired) < 20e-6, firing
+    print(f"{pending} timers scheduled in {scheduling:.2f}s, {len(cancelled)} cancelled in {cancelling:.3f}s")
+    print(f"{len(fired)} fired in due order over {ticks} hourly ticks in {firing:.2f}s "
+          f"({firing / len(fired) * 1e6:.1f}us each)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Compares the trigram title index with a SequenceMatcher scan over every title of one large guild
+
+Run from the repository root with ``python -m benchmarks.bench_tag_search``.
+"""
+import heapq
+import random
+import string
+import timeit
+from difflib import SequenceMatcher
+
+from src.discord.utils.tagindex import TrigramIndex
+
+
+def main(size: int = 50000, queries: int = 200):
+    rng = random.Random(0)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8))) for _ in range(3000)]
+    titles = set()
+    while len(titles) < size:
+        titles.add(" ".join(rng.sample(words, rng.randint(1, 3))))
+    titles = list(titles)
+    originals = rng.sample(titles, queries)
+    # One typo in the last character of each title
+    samples = [title[:-1] + rng.choice(string.ascii_lowercase) for title in originals]
+
+    built = timeit.timeit(lambda: TrigramIndex(titles), number=1)
+    index = TrigramIndex(titles)
+    for title in originals:
+        assert index.search(title, limit=1)[0][1] == title
+    indexed = timeit.timeit(lambda: [index.search(query, limit=3) for query in samples], number=1)
+    found = sum(1 for query, original in zip(samples, originals)
+                if original in [title for _, title in index.search(query, limit=3)])
+    assert found >= queries * 0.9, found
+
+    def scan(query):
+        return heapq.nlargest(3, ((SequenceMatcher(None, title, query).ratio(), title) for title in titles))
+
+    scanned_queries = samples[:5]
+    scanned = timeit.timeit(lambda: [scan(query) for query in scanned_queries], number=1)
+    per_query, per_scan = indexed / queries, scanned / len(scanned_queries)
+    print(f"{len(titles)} titles, index built in {built:.2f}s")
+    print(f"   trigram: {per_query * 1e3:.2f}ms per query, {found}/{queries} with the original title in the top 3")
+    print(f"   difflib: {per_scan * 1e3:.2f}ms per query")
+    assert per_query < per_scan
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ import discord
 from discord.ext import commands
 
 from Iceteabot import Iceteabot
+from src.discord.utils.errors import BackendUnavailable
 from src.discord.utils.nextgen import Guild, User
 
 
@@ -47,6 +48,8 @@ class BotEvents:
                 f"You can use ``{ctx.prefix}help {ctx.invoked_with}`` for more info")
         elif hasattr(ctx.cog, f"_{ctx.cog.__class__.__name__}__error"):
             return
+        elif isinstance(getattr(error, "original", error), BackendUnavailable):
+            await ctx.send(str(getattr(error, "original", error)), delete_after=10)
         # Reports on non generic errors
         elif isinstance(error, commands.errors.CommandInvokeError):
             try:
@@ -143,8 +146,9 @@ class BotEvents:
     async def on_guild_join(self, new_guild: discord.Guild):
         if not self.bot.data_base_built:
             return
-        self.bot.guild_data[new_guild.id] = await self.bot.dto.get(Guild, guild=new_guild.id, create=True)
-        self.bot.guild_commands_used[new_guild.id] = Counter()
+        guild_data = await self.bot.dto.get(Guild, guild=new_guild.id, create=True)
+        if guild_data is not None:
+            self.bot.mark_guild_ready(guild_data)
         await self.update_discord_bots()
 
     async def on_guild_remove(self, old_guild: discord.Guild):
@@ -178,7 +182,7 @@ class BotEvents:
             "author": ctx.author.id,
             "called": None,
         }
-        await self.bot.post_data(payload, "commandcall")
+        self.bot.dto.telemetry.record("commandcall", payload)
         if ctx.guild is None:
             return
         self.bot.commands_used[ctx.command.name] += 1
@@ -187,8 +191,7 @@ class BotEvents:
         except KeyError:
             ctx.bot.guild_commands_used[ctx.guild] = Counter({ctx.command: 1})
         try:
-            ctx.prefix_data.uses += 1
-            await ctx.prefix_data.update()
+            ctx.prefix_data.increment("uses")
         except AttributeError:
             return
 
@@ -106,6 +106,33 @@ class Stats:
         embed.add_field(name='Process', value=f'{memory_usage:.2f} MiB\n{cpu_usage:.2f}% CPU')
         await ctx.send(embed=embed)
 
+    @commands.command(hidden=True)
+    @commands.is_owner()
+    async def health(self, ctx):
+        """Displays the state of the connection to the Iceteacity API"""
+        health = ctx.bot.dto.health
+        colour = discord.Colour.green() if health["Backend"]["state"] == "closed" else discord.Colour.red()
+        embed = discord.Embed(title="Backend Health", colour=colour)
+        for section, values in health.items():
+            embed.add_field(name=section, value="\n".join(f"**{name}**: {value}" for name, value in values.items())
+                            or "N/A")
+        embed.add_field(name="Message replay",
+                        value="\n".join(f"**{name}**: {value}" for name, value in ctx.bot.message_buffer.stats.items()))
+        activity = ctx.bot.get_cog("Activity")
+        if activity is not None:
+            embed.add_field(name="Activity roles",
+                            value="\n".join(f"**{name}**: {value}" for name, value in activity.engine.stats.items()))
+        if ctx.guild is not None and ctx.guild.id in ctx.bot.guild_data:
+            usage = ctx.bot.guild_data[ctx.guild.id].memory_usage()
+            embed.add_field(name="This guild's tags",
+                            value="\n".join(f"**{name}**: {value}" for name, value in usage.items()))
+            if activity is not None:
+                embed.add_field(name="This guild's activity roles",
+                                value="\n".join(f"**{name}**: {value}"
+                                                 for name, value in activity.engine.guild_stats(ctx.guild.id).items()))
+        embed.timestamp = datetime.datetime.utcnow()
+        await ctx.send(embed=embed)
+
     @commands.command()
     async def invite(self, ctx):
         """Grabs the bot's invite link to share"""
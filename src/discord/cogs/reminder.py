@@ -48,11 +48,9 @@ class Reminder:
         --------
         :class:`ReminderDTO`
         """
-        reminder: ReminderDTO = await ctx.bot.dto.get(ReminderDTO,
-                                                      {"message": when.arg, "timestamp": ctx.message.created_at,
-                                                       "channel": ctx.channel.id, "delta": when.dt, "event": event,
-                                                       "private": not ctx.guild}, user=ctx.author.id, create=True)
-        await reminder.start()
+        reminder: ReminderDTO = await ctx.bot.dto.add_reminder(message=when.arg, timestamp=ctx.message.created_at,
+                                                               channel=ctx.channel.id, delta=when.dt, event=event,
+                                                               private=not ctx.guild, user=ctx.author.id)
         return reminder
 
     @commands.group(aliases=['timer', 'remind'], usage='<when>', invoke_without_command=True)
@@ -80,7 +78,8 @@ class Reminder:
     @reminder.command(name="list")
     async def reminder_list(self, ctx):
         """Shows the user's 5 latest currently runny reminders that are within a day of expiring"""
-        reminders = await ctx.bot.fetch_data(f"users/{ctx.author.id}/reminders")
+        reminders = list(await ctx.bot.fetch_data(f"users/{ctx.author.id}/reminders"))
+        reminders += [reminder.to_payload() for reminder in ctx.bot.dto.local_reminders(ctx.author.id)]
         guild_reminders = []
         for remind in reminders:
             reminder_channel = discord.utils.get(ctx.guild.channels, id=remind['channel'])
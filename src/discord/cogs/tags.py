@@ -1,7 +1,5 @@
 import random
 import typing
-from collections import Counter
-from difflib import SequenceMatcher
 
 from src.discord.utils.nextgen import Tag
 from src.discord.utils.paginator import TagPaginator
@@ -25,11 +23,12 @@ class Tags:
 
     async def __error(self, ctx, error):
         if isinstance(error, TagNotFound):
-            # response_list = await self.search_tags(ctx, error.param)
-            # if len(response_list) > 0:
-            #     response_message = "\n".join([row.id for row in response_list])
-            #     await ctx.send(f"Tag **{error.param}** not found\ninstead found these tags:\n\n{response_message}")
-            await ctx.send(f"Tag ``{error.param}`` Not Found")
+            response_list = self.search_tags(ctx, error.param, limit=3)
+            if len(response_list) > 0:
+                response_message = self.clean_tag_content("\n".join(response_list))
+                await ctx.send(f"Tag ``{error.param}`` Not Found, did you mean:\n{response_message}")
+            else:
+                await ctx.send(f"Tag ``{error.param}`` Not Found")
         elif isinstance(error, TagAlreadyExists):
             await ctx.send(f"``{error.param}`` already exists")
         else:
@@ -41,54 +40,36 @@ class Tags:
 
     def get_tags_by_member(self, ctx, member) -> typing.List[Tag]:
         """Cache lookup"""
-        return sorted([tag for tag in ctx.guild_data.tags.values() if tag.author == member.id],
-                      key=lambda tag: tag.count, reverse=True)
+        return sorted(ctx.guild_data.get_tags_by_author(member.id), key=lambda tag: tag.count, reverse=True)
 
-    def top_tag_creators(self, ctx):
-        data = Counter()
-        for tag in ctx.guild_data.tags.values():
-            data[tag.author] += 1
-        return data
-
-    async def get_top_tag_users(self, ctx):
-        """Tag Board calls"""
-        payload = await self.bot.fetch_data(f"guilds/{ctx.guild.id}/tagboard")
-        return payload
+    def medal_lines(self, ctx, entries, unit):
+        lines = []
+        for medal, (user, score) in zip(self.medals, entries):
+            member = ctx.guild.get_member(int(user))
+            lines.append(f"{medal} : {member.mention if member else user} ({score} {unit})")
+        return "\n".join(lines) or "\u200b"
 
     async def guild_tag_stats(self, ctx):
         """Cache lookup"""
         if not len(ctx.guild_data.tags) >= 3:
             return await ctx.send("This guild does not have enough data for this command")
+        stats = await ctx.guild_data.get_tag_stats()
         embed = discord.Embed(colour=discord.Colour.blurple(), title=f"{ctx.guild.name} Stats")
         embed.set_footer(text="These statistics are server-specific")
-        guild_tags = ctx.guild_data.tags
-        embed.description = f"{len(guild_tags)} tags, {sum([tag.count for tag in guild_tags.values()])} Tag Uses"
-        top_tags = sorted(guild_tags.values(), key=lambda tag: tag.count, reverse=True)
-        top_tag_users = await self.get_top_tag_users(ctx)
-        data = {}
-        for member, calls in top_tag_users.items():
-            data[member] = sum(calls.values())
-        top_tag_users = data
-        top_tag_creators = self.top_tag_creators(ctx)
-        top_three_tags = ["{0} : {1} ({2} uses)".format(medal, tag, tag.count) for medal, tag in
-                          zip(self.medals, top_tags)]
-        top_three_users = [
-            "{0} : {1} ({2} times)".format(medal, ctx.guild.get_member(int(user)).mention, top_tag_users[user]) for
-            medal, user in zip(self.medals, top_tag_users)]
-        top_three_creators = [
-            "{0} : {1} ({2} tags)".format(medal, ctx.guild.get_member(int(user)).mention, top_tag_creators[user]) for
-            medal, user in zip(self.medals, top_tag_creators)
-        ]
-        embed.add_field(name="Top Tags", value="\n".join(top_three_tags), inline=False)
-        embed.add_field(name="Top Tag Users", value="\n".join(top_three_users), inline=False)
-        embed.add_field(name="Top Tag Creators", value="\n".join(top_three_creators), inline=False)
+        embed.description = f"{len(stats.tags)} tags, {stats.tags.total} Tag Uses"
+        top_three_tags = ["{0} : {1} ({2} uses)".format(medal, tag, uses) for medal, (tag, uses) in
+                          zip(self.medals, stats.tags.top(3))]
+        embed.add_field(name="Top Tags", value="\n".join(top_three_tags) or "\u200b", inline=False)
+        embed.add_field(name="Top Tag Users", value=self.medal_lines(ctx, stats.users.top(3), "times"), inline=False)
+        embed.add_field(name="Top Tag Creators", value=self.medal_lines(ctx, stats.creators.top(3), "tags"),
+                        inline=False)
         return await ctx.send(embed=embed)
 
     async def member_tag_stats(self, ctx, member):
         """Cache Lookup"""
         tags = self.get_tags_by_member(ctx, member)
-        data = await self.get_top_tag_users(ctx)
-        data = data[str(member.id)]
+        stats = await ctx.guild_data.get_tag_stats()
+        data = stats.member_calls.get(member.id, {})
         embed = discord.Embed(colour=discord.Colour.blurple())
         embed.set_footer(text='These statistics are server-specific.')
         embed.set_author(name=member.display_name, icon_url=member.avatar_url)
@@ -174,17 +155,10 @@ class Tags:
         await ctx.guild_data.create_alias(name, new_alias, ctx.author.id)
         await ctx.send(":thumbsup:")
 
-    async def search_tags(self, ctx, query):
-
-        guild_tags = ctx.guild_data.tags
-        response_list = []
-        for tag in guild_tags:
-            match_percent = SequenceMatcher(None, tag.title, query).ratio()
-            if match_percent >= 3.0:
-                continue
-            if match_percent > .60:
-                response_list.append(tag)
-        return response_list
+    @staticmethod
+    def search_tags(ctx, query, limit=3) -> typing.List[str]:
+        """Tag and alias titles most similar to the query, best first"""
+        return [title for score, title in ctx.guild_data.tag_index.search.search(query, limit=limit)]
 
     @tag.command()
     async def stats(self, ctx, user: discord.Member = None):
@@ -199,11 +173,11 @@ class Tags:
         """Claims an orphaned tag"""
         tag, alias = ctx.guild_data.get_tag(otag)
 
-        if otag.orphaned:
-            otag.author = str(ctx.author.id)
-            otag.orphaned = False
-            await otag.save()
-            await ctx.send(f"You have sucessfully claimed {otag.id}")
+        if tag.orphaned:
+            ctx.guild_data.change_tag_author(tag, ctx.author.id)
+            tag.orphaned = False
+            await tag.save()
+            await ctx.send(f"You have sucessfully claimed {tag.id}")
         else:
             await ctx.send("This tag already has an owner")
 
@@ -212,10 +186,10 @@ class Tags:
         """Allows a user to unclaim a tag, used for trading tags?"""
         tag, alias = ctx.guild_data.get_tag(otag)
 
-        if not otag.orphaned:
-            otag.orphaned = True
-            otag.author = "00000000000000000000"
-            await otag.save()
+        if not tag.orphaned:
+            tag.orphaned = True
+            ctx.guild_data.change_tag_author(tag, 0)
+            await tag.save()
             await ctx.send("You no longer own this tag and can be claimed by anyone")
         else:
             await ctx.send("You do not own this tag")
@@ -232,9 +206,9 @@ class Tags:
         doggo
 
         """
-        response_list = await self.search_tags(ctx, query)
+        response_list = self.search_tags(ctx, query)
         if len(response_list) > 0:
-            response_message = "\n".join([r.id for r in response_list[:3]])
+            response_message = self.clean_tag_content("\n".join(response_list))
             await ctx.send(f"Found these tags:\n{response_message}")
         else:
             await ctx.send("No similar tags found")
@@ -0,0 +1,132 @@
+import asyncio
+import collections
+import logging
+import typing
+from time import perf_counter
+
+
+class ActivityRoles:
+    """A guild's tracked activities as lookups: lower cased activity name -> role id and the set of those role ids"""
+    __slots__ = ("by_status", "role_ids")
+
+    def __init__(self, statuses: typing.Iterable[str], roles: typing.Iterable[int]):
+        self.by_status: typing.Dict[str, int] = {status.lower(): role for status, role in zip(statuses, roles)
+                                                 if status and role}
+        self.role_ids: typing.FrozenSet[int] = frozenset(self.by_status.values())
+
+    def __bool__(self):
+        return bool(self.by_status)
+
+    def changes(self, member) -> typing.Tuple[typing.Optional[int], typing.Set[int]]:
+        """The activity role ``member`` is missing (or None) and the activity roles they hold but should not"""
+        name = getattr(member.activity, "name", None)
+        wanted = self.by_status.get(name.lower()) if name else None
+        held = {role.id for role in member.roles if role.id in self.role_ids}
+        return (wanted if wanted is not None and wanted not in held else None), held - {wanted}
+
+
+class ActivityRoleEngine:
+    """Keeps premium guilds' activity roles in step with what their members are playing
+
+    ``member_changed`` handles a single member, from ``on_member_update`` when their activity changes. ``reconcile``
+    is the safety net for missed events: every ``RECONCILE_INTERVAL`` seconds it walks every member of every premium
+    guild, handing the event loop back after each ``SLICE`` seconds of work. Role changes are dispatched as
+    ``member_activity_update`` events. Time spent per guild is kept in ``timings``.
+    """
+    RECONCILE_INTERVAL = 600
+    SLICE = 0.005
+
+    __slots__ = ("_bot", "_task", "timings", "logger")
+
+    def __init__(self, bot):
+        self._bot = bot
+        self._task: typing.Optional[asyncio.Task] = None
+        self.timings: typing.Dict[int, typing.Counter[str]] = collections.defaultdict(collections.Counter)
+        self.logger = logging.getLogger("errors")
+
+    def _roles_for(self, guild) -> typing.Optional[ActivityRoles]:
+        guild_data = self._bot.guild_data.get(guild.id)
+        if guild_data is None or not guild_data.premium:
+            return None
+        return guild_data.activity_map or None
+
+    def _apply(self, member, roles: ActivityRoles) -> int:
+        add, remove = roles.changes(member)
+        updates = [(add, True)] if add is not None else []
+        updates.extend((role_id, False) for role_id in remove)
+        changed = 0
+        for role_id, adding in updates:
+            role = member.guild.get_role(role_id)
+            if role is not None:
+                self._bot.dispatch("member_activity_update", member, role, adding)
+                changed += 1
+        return changed
+
+    def member_changed(self, member) -> int:
+        """Dispatches the role changes for one member, returns how many"""
+        roles = self._roles_for(member.guild)
+        if roles is None:
+            return 0
+        started = perf_counter()
+        changed = self._apply(member, roles)
+        timing = self.timings[member.guild.id]
+        timing["events"] += 1
+        timing["event seconds"] += perf_counter() - started
+        timing["changes"] += changed
+        return changed
+
+    async def reconcile(self) -> int:
+        """One full pass over every premium guild, returns how many role changes it dispatched"""
+        changed = 0
+        for guild in list(self._bot.guilds):
+            roles = self._roles_for(guild)
+            if roles is None:
+                continue
+            timing = self.timings[guild.id]
+            busy = 0.0
+            started = perf_counter()
+            for member in list(guild.members):
+                changed_here = self._apply(member, roles)
+                timing["changes"] += changed_here
+                changed += changed_here
+                if perf_counter() - started >= self.SLICE:
+                    busy += perf_counter() - started
+                    await asyncio.sleep(0)
+                    started = perf_counter()
+            busy += perf_counter() - started
+            timing["sweeps"] += 1
+            timing["sweep seconds"] += busy
+        return changed
+
+    async def _run(self):
+        await self._bot.wait_for_database.wait()
+        while not self._bot.is_closed():
+            try:
+                await self.reconcile()
+            except Exception:
+                self.logger.exception("Activity role reconciliation failed")
+            await asyncio.sleep(self.RECONCILE_INTERVAL)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = self._bot.loop.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def guild_stats(self, guild_id: int) -> typing.Dict[str, typing.Any]:
+        timing = self.timings.get(guild_id, collections.Counter())
+        return {"events": timing["events"], "sweeps": timing["sweeps"], "role changes": timing["changes"],
+                "event ms": round(timing["event seconds"] * 1e3, 2),
+                "ms per sweep": round(timing["sweep seconds"] / timing["sweeps"] * 1e3, 2) if timing["sweeps"] else 0}
+
+    @property
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        total = collections.Counter()
+        for timing in self.timings.values():
+            total.update(timing)
+        slowest = max(self.timings, key=lambda guild: self.timings[guild]["sweep seconds"], default=None)
+        return {"guilds": len(self.timings), "events": total["events"], "sweeps": total["sweeps"],
+                "role changes": total["changes"], "event ms": round(total["event seconds"] * 1e3, 2),
+                "sweep ms": round(total["sweep seconds"] * 1e3, 2), "slowest guild": slowest}
@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import sys
+import typing
+import weakref
+import zlib
+from time import monotonic
+
+
+class Body:
+    """Handle to one distinct tag content, every tag with the same text shares it
+
+    The text lives in memory as ``_text`` while hot or ``_packed`` (zlib) while cold. Once paged out it is only
+    at ``_offset`` in the store's page file, and that region stays assigned after the body is read back, since
+    the text never changes, so paging it out again writes nothing.
+    """
+    __slots__ = ("digest", "length", "_text", "_packed", "_offset", "_size", "last_used", "__weakref__")
+
+    def __init__(self, digest: bytes, text: str):
+        self.digest = digest
+        self.length = len(text)
+        self._text: typing.Optional[str] = text
+        self._packed: typing.Optional[bytes] = None
+        self._offset: typing.Optional[int] = None
+        self._size = 0
+        self.last_used = monotonic()
+
+    @property
+    def state(self) -> str:
+        if self._text is not None:
+            return "hot"
+        return "cold" if self._packed is not None else "paged"
+
+    @property
+    def resident(self) -> int:
+        """Bytes this body keeps in memory, paged bodies only cost the handle"""
+        if self._text is not None:
+            return sys.getsizeof(self._text)
+        if self._packed is not None:
+            return sys.getsizeof(self._packed)
+        return 0
+
+
+class ContentStore:
+    """Content addressed store for tag bodies, shared by every guild so duplicate contents are held once
+
+    ``sweep`` compresses bodies nobody has read for ``COLD_AFTER`` seconds and moves compressed bodies unread for
+    ``PAGE_AFTER`` seconds to a page file that is read back through mmap. Reading a body makes it hot again.
+    Bodies are only weakly referenced here and disappear with the last tag using them. Their regions are
+    reclaimed by rewriting the page file once a sweep finds more than ``COMPACT_MIN`` bytes, and more than half
+    the file, no longer in use.
+    """
+    COLD_AFTER = 600
+    PAGE_AFTER = 3600
+    COMPRESS_MIN = 256
+    PAGE_MIN = 512
+    SWEEP_BATCH = 500
+    COMPACT_MIN = 4 * 1024 * 1024
+    PAGE_PATH = os.path.join("data", "tag_content.pages")
+
+    __slots__ = ("_bodies", "_path", "_file", "_map", "_size", "shared", "compressed", "paged_out", "paged_in",
+                 "compactions")
+
+    def __init__(self, path: str = None):
+        self._bodies: typing.MutableMapping[bytes, Body] = weakref.WeakValueDictionary()
+        self._path = path or self.PAGE_PATH
+        self._file: typing.Optional[typing.BinaryIO] = None
+        self._map: typing.Optional[mmap.mmap] = None
+        self._size = 0
+        self.shared = 0
+        self.compressed = 0
+        self.paged_out = 0
+        self.paged_in = 0
+        self.compactions = 0
+
+    def __len__(self):
+        return len(self._bodies)
+
+    def put(self, text: typing.Union[str, Body, None]) -> typing.Optional[Body]:
+        if text is None or isinstance(text, Body):
+            return text
+        digest = hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest()
+        body = self._bodies.get(digest)
+        if body is not None:
+            self.shared += 1
+            return body
+        body = self._bodies[digest] = Body(digest, text)
+        return body
+
+    def read(self, body: typing.Optional[Body]) -> typing.Optional[str]:
+        if body is None:
+            return None
+        body.last_used = monotonic()
+        if body._text is not None:
+            return body._text
+        packed = body._packed
+        if packed is None:
+            packed = self._read_page(body._offset, body._size)
+            self.paged_in += 1
+        body._text = zlib.decompress(packed).decode("utf-8", "surrogatepass")
+        body._packed = None
+        return body._text
+
+    def peek(self, body: Body) -> str:
+        """Reads a body without warming it up, for bulk exports such as snapshots"""
+        if body._text is not None:
+            return body._text
+        packed = body._packed if body._packed is not None else self._read_page(body._offset, body._size)
+        return zlib.decompress(packed).decode("utf-8", "surrogatepass")
+
+    def _read_page(self, offset: int, size: int) -> bytes:
+        if self._file is None:
+            raise ValueError(f"{self._path} is closed, no paged body can be read")
+        if self._map is None or len(self._map) < offset + size:
+            self._file.flush()
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:offset + size]
+
+    def _compress(self, body: Body):
+        packed = zlib.compress(body._text.encode("utf-8", "surrogatepass"))
+        if len(packed) < sys.getsizeof(body._text):
+            body._packed, body._text = packed, None
+            self.compressed += 1
+
+    def _page_out(self, body: Body):
+        if body._offset is None:
+            if self._file is None:
+                # Nothing from an earlier run is referenced any more, so start every run from empty
+                self._file = open(self._path, "w+b")
+            self._file.seek(self._size)
+            self._file.write(body._packed)
+            body._offset, body._size = self._size, len(body._packed)
+            self._size += body._size
+        body._packed = None
+        self.paged_out += 1
+
+    def _compact(self):
+        """Rewrites the page file with only the regions of bodies that are still alive"""
+        temp_path = f"{self._path}.tmp"
+        compacted = open(temp_path, "w+b")
+        size = 0
+        for body in sorted((body for body in self._bodies.values() if body._offset is not None),
+                           key=lambda body: body._offset):
+            compacted.write(self._read_page(body._offset, body._size))
+            body._offset = size
+            size += body._size
+        compacted.flush()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        os.replace(temp_path, self._path)
+        self._file, self._size = compacted, size
+        self.compactions += 1
+
+    async def sweep(self):
+        """Moves idle bodies one tier colder, yielding to the event loop every ``SWEEP_BATCH`` bodies"""
+        now = monotonic()
+        for index, body in enumerate(list(self._bodies.values())):
+            idle = now - body.last_used
+            if body._text is not None:
+                if idle >= self.COLD_AFTER and body.length >= self.COMPRESS_MIN:
+                    self._compress(body)
+            elif body._packed is not None and idle >= self.PAGE_AFTER and len(body._packed) >= self.PAGE_MIN:
+                self._page_out(body)
+            if index % self.SWEEP_BATCH == self.SWEEP_BATCH - 1:
+                await asyncio.sleep(0)
+        if self._file is not None:
+            self._file.flush()
+            live = sum(body._size for body in self._bodies.values() if body._offset is not None)
+            if self._size - live > max(self.COMPACT_MIN, live):
+                self._compact()
+
+    @staticmethod
+    def usage(bodies: typing.Iterable[Body]) -> typing.Dict[str, int]:
+        """Memory accounting over a set of bodies, each distinct body is counted once"""
+        usage = {"bodies": 0, "hot": 0, "cold": 0, "paged": 0, "resident": 0}
+        for body in {id(body): body for body in bodies if body is not None}.values():
+            usage["bodies"] += 1
+            usage[body.state] += 1
+            usage["resident"] += body.resident
+        return usage
+
+    @property
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        stats = self.usage(self._bodies.values())
+        stats.update({"shared": self.shared, "page file": self._size, "paged in": self.paged_in,
+                      "compactions": self.compactions})
+        return stats
+
+    def close(self):
+        """Pulls paged bodies back into memory compressed and removes the page file"""
+        if self._file is not None:
+            for body in list(self._bodies.values()):
+                if body.state == "paged":
+                    body._packed = self._read_page(body._offset, body._size)
+                body._offset = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self._path)
+        self._size = 0
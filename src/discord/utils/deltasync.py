@@ -0,0 +1,117 @@
+import abc
+import asyncio
+import datetime
+import typing
+
+from src.discord.utils.errors import BackendUnavailable
+from src.discord.utils.nextgen import parse_date
+
+
+class ChangeFeed(abc.ABC):
+    """Source of guild configuration changes, each record looks like
+
+    ``{"model": "tag", "action": "upsert" or "delete", "guild": 1234, "modified": iso timestamp, "data": {...}}``
+    """
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def changes(self, since: datetime.datetime) -> typing.AsyncIterator[dict]:
+        """Async iterator over the records modified after ``since``"""
+
+
+class BackendChangeFeed(ChangeFeed):
+    """Reads the backend's ``changes`` endpoint, which lists records modified after ``since``"""
+    __slots__ = ("_dto", "url")
+
+    def __init__(self, dto, url: str = "changes"):
+        self._dto = dto
+        self.url = url
+
+    async def changes(self, since: datetime.datetime) -> typing.AsyncIterator[dict]:
+        async for record in self._dto.iter_data(self.url, data={"since": since.isoformat()}):
+            yield record
+
+
+class LocalChangeFeed(ChangeFeed):
+    """In process stand in for the backend feed, whatever is published here is served to the sync loop"""
+    __slots__ = ("records",)
+
+    def __init__(self):
+        self.records: typing.List[dict] = []
+
+    def publish(self, model: str, guild: int, data: dict, action: str = "upsert",
+                modified: datetime.datetime = None) -> dict:
+        record = {"model": model, "action": action, "guild": guild, "data": data,
+                  "modified": (modified or datetime.datetime.utcnow()).isoformat()}
+        self.records.append(record)
+        return record
+
+    async def changes(self, since: datetime.datetime) -> typing.AsyncIterator[dict]:
+        for record in list(self.records):
+            if parse_date(record['modified']) > since:
+                yield record
+
+
+class DeltaSync:
+    """Keeps ``bot.guild_data`` in step with edits made outside the bot (the web dashboard)
+
+    Every ``INTERVAL`` seconds the feed is asked for records modified after the high water mark, which is the
+    newest ``modified`` timestamp applied so far. Only those records touch the in memory guilds.
+    """
+    INTERVAL = 30
+    # Start a little before the sync began so edits racing the initial load are replayed, upserts are idempotent
+    START_OVERLAP = datetime.timedelta(seconds=60)
+
+    __slots__ = ("_bot", "_feed", "_task", "watermark", "applied", "ignored")
+
+    def __init__(self, bot, feed: ChangeFeed, since: datetime.datetime = None):
+        self._bot = bot
+        self._feed = feed
+        self._task: typing.Optional[asyncio.Task] = None
+        self.watermark = (since or datetime.datetime.utcnow()) - self.START_OVERLAP
+        self.applied = 0
+        self.ignored = 0
+
+    @property
+    def logger(self):
+        return self._bot.error_logger
+
+    def apply(self, record: dict) -> bool:
+        guild = self._bot.guild_data.get(record.get("guild"))
+        if guild is None or not guild.apply_change(record.get("model"), record.get("action", "upsert"),
+                                                   record.get("data") or {}):
+            self.ignored += 1
+            return False
+        self.applied += 1
+        return True
+
+    async def poll(self) -> int:
+        """Applies every change newer than the watermark, returns how many were applied"""
+        applied = 0
+        watermark = self.watermark
+        async for record in self._feed.changes(self.watermark):
+            if self.apply(record):
+                applied += 1
+            modified = parse_date(record.get("modified"))
+            if modified is not None and modified > watermark:
+                watermark = modified
+        self.watermark = watermark
+        return applied
+
+    async def _run(self):
+        while not self._bot.is_closed():
+            await asyncio.sleep(self.INTERVAL)
+            try:
+                await self.poll()
+            except BackendUnavailable as e:
+                self.logger.warning(f"Delta sync skipped : {e}")
+            except Exception:
+                self.logger.exception("Delta sync failed")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = self._bot.loop.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
@@ -65,6 +65,12 @@ class BlackListed(CommandError):
     pass
 
 
+class BackendUnavailable(CommandError):
+    def __init__(self, retry_after: float = 0):
+        self.retry_after = retry_after
+        super().__init__(f"The Iceteacity API is unavailable right now, try again in {retry_after:.0f} seconds")
+
+
 class BadTask(UserInputError):
     pass
 
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+import typing
+import ujson
+
+
+class TimerJournal:
+    """Append-only local log of every pending timer, replayed at boot
+
+    Each line is one json record, ``["+", kind, id, data]`` when a timer is added or moved and ``["-", kind, id]``
+    once it has fired or was cancelled. Appends only reach the file buffer, it is flushed and fsynced at most every
+    ``FSYNC_INTERVAL`` seconds or as soon as ``FSYNC_BATCH`` records are waiting. ``replay`` folds the log into the
+    timers still pending and rewrites the file with just those, a torn last line from a crash is dropped.
+    Timers that only live here get negative ids so they never clash with the backend's, ``next_id`` only hands
+    them out after ``replay`` has seen which ones the log already holds.
+    """
+    PATH = os.path.join("data", "timers.journal")
+    FSYNC_INTERVAL = 1.0
+    FSYNC_BATCH = 64
+
+    __slots__ = ("_path", "_loop", "_file", "_live", "_unsynced", "_sync_handle", "_next_id", "_replayed", "replayed",
+                 "appended", "fsyncs", "logger")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None, path: str = None):
+        self._path = path or self.PATH
+        self._loop = loop
+        self._file: typing.Optional[typing.TextIO] = None
+        self._live: typing.Dict[typing.Tuple[str, int], dict] = {}
+        self._unsynced = 0
+        self._sync_handle: typing.Optional[asyncio.Handle] = None
+        self._next_id = -1
+        self._replayed: typing.Optional[asyncio.Event] = None
+        self.replayed = False
+        self.appended = 0
+        self.fsyncs = 0
+        self.logger = logging.getLogger("errors")
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, key):
+        return key in self._live
+
+    def next_id(self) -> int:
+        if not self.replayed:
+            raise RuntimeError(f"Local timer ids are handed out once {self._path} has been replayed")
+        local_id = self._next_id
+        self._next_id -= 1
+        return local_id
+
+    def _read(self) -> typing.Dict[typing.Tuple[str, int], dict]:
+        live = {}
+        try:
+            with open(self._path, "r", encoding="utf-8") as file:
+                for number, line in enumerate(file, 1):
+                    try:
+                        record = ujson.loads(line)
+                    except ValueError:
+                        self.logger.warning(f"Skipping unreadable line {number} of {self._path}")
+                        continue
+                    if record[0] == "+":
+                        live[(record[1], record[2])] = record[3]
+                    else:
+                        live.pop((record[1], record[2]), None)
+        except FileNotFoundError:
+            pass
+        return live
+
+    def _compact(self):
+        temp_path = f"{self._path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for (kind, timer_id), data in self._live.items():
+                file.write(ujson.dumps(["+", kind, timer_id, data]) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self._path)
+
+    def replay(self) -> typing.List[typing.Tuple[str, int, dict]]:
+        """Reads back the pending timers as (kind, id, data), compacting the file, and opens it for appending"""
+        self.close()
+        self._live = self._read()
+        self._compact()
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._next_id = min([timer_id for _, timer_id in self._live if timer_id < 0] + [0]) - 1
+        self.mark_replayed()
+        return [(kind, timer_id, data) for (kind, timer_id), data in self._live.items()]
+
+    def mark_replayed(self):
+        """Lets ``next_id`` go ahead, ``replay`` calls it and so should whoever gives up on replaying"""
+        self.replayed = True
+        if self._replayed is not None:
+            self._replayed.set()
+
+    async def wait_replayed(self):
+        if self.replayed:
+            return
+        if self._replayed is None:
+            self._replayed = asyncio.Event()
+        await self._replayed.wait()
+
+    def _append(self, record: list):
+        if self._file is None:
+            self._file = open(self._path, "a", encoding="utf-8")
+        self._file.write(ujson.dumps(record) + "\n")
+        self.appended += 1
+        self._unsynced += 1
+        if self._unsynced >= self.FSYNC_BATCH:
+            self.sync()
+        elif self._sync_handle is None and self._loop is not None:
+            self._sync_handle = self._loop.call_later(self.FSYNC_INTERVAL, self.sync)
+
+    def record(self, kind: str, timer_id: int, data: dict):
+        """Notes a pending timer, re-recording one with unchanged data costs nothing"""
+        key = (kind, timer_id)
+        if self._live.get(key) == data:
+            return
+        self._live[key] = data
+        self._append(["+", kind, timer_id, data])
+
+    def forget(self, kind: str, timer_id: int):
+        if self._live.pop((kind, timer_id), None) is not None:
+            self._append(["-", kind, timer_id])
+
+    def sync(self):
+        if self._sync_handle is not None:
+            self._sync_handle.cancel()
+            self._sync_handle = None
+        if self._file is None or not self._unsynced:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError:
+            self.logger.exception(f"Unable to sync {self._path}")
+            return
+        self._unsynced = 0
+        self.fsyncs += 1
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        return {"pending": len(self._live), "appended": self.appended, "fsyncs": self.fsyncs}
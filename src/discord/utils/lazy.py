@@ -0,0 +1,109 @@
+import collections.abc
+import typing
+from time import monotonic
+
+
+class LazyCollection(collections.abc.MutableMapping):
+    """One of a guild's sub-collections (tags, prefixes, faqs...) that only builds model objects once it is used
+
+    Until then, and again after ``evict`` finds it idle, it holds one compact tuple per record (see
+    ``API.compact``) instead of a dict of model objects. ``len`` never builds anything.
+    """
+    __slots__ = ("_model", "_key", "_dto", "_guild", "_records", "_keys", "_items", "last_used")
+
+    def __init__(self, model, key: str, dto, guild: int, payloads: typing.Iterable[dict] = ()):
+        self._model = model
+        self._key = key
+        self._dto = dto
+        self._guild = guild
+        self._records: typing.Optional[typing.List[tuple]] = [model.compact(payload) for payload in payloads]
+        self._keys: typing.Optional[typing.FrozenSet] = None
+        self._items: typing.Optional[dict] = None
+        self.last_used = 0.0
+
+    @property
+    def materialized(self) -> bool:
+        return self._items is not None
+
+    def _build(self, payload: dict):
+        return self._model(self._dto, **dict(payload, guild=self._guild))
+
+    def _materialize(self) -> dict:
+        self.last_used = monotonic()
+        if self._items is None:
+            expand = self._model.expand
+            items = {}
+            for record in self._records:
+                payload = expand(record)
+                items[payload[self._key]] = self._build(payload)
+            self._items, self._records, self._keys = items, None, None
+        return self._items
+
+    def __getitem__(self, key):
+        return self._materialize()[key]
+
+    def __setitem__(self, key, value):
+        self._materialize()[key] = value
+
+    def __delitem__(self, key):
+        del self._materialize()[key]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __contains__(self, key):
+        if self._items is not None:
+            return key in self._items
+        if self._keys is None:
+            # Compact records never change, every edit materializes first, so this set stays valid until then
+            index = self._field_index(self._key)
+            self._keys = frozenset(record[index] for record in self._records)
+        return key in self._keys
+
+    def __len__(self):
+        if self._items is None:
+            return len(self._records)
+        return len(self._items)
+
+    def __repr__(self):
+        state = "materialized" if self.materialized else "compact"
+        return f"<LazyCollection {self._model.__name__} {state} len={len(self)}>"
+
+    def payloads(self) -> typing.List[dict]:
+        """Every record in the backend's payload shape, without building objects for a compact collection"""
+        if self._items is None:
+            return [self._model.export(record) for record in self._records]
+        return [item.to_payload() for item in self._items.values()]
+
+    def _field_index(self, source: str) -> int:
+        return next(index for index, field in enumerate(self._model.FIELDS)
+                    if field.name == source or field.sources[0] == source)
+
+    def field_values(self, name: str) -> typing.List:
+        """One field of every record, read without building objects for a compact collection
+
+        Fields a compact record's payload lacked read as the field's default rather than the ``MISSING`` marker.
+        """
+        if self._items is None:
+            index = self._field_index(name)
+            field = self._model.FIELDS[index]
+            missing = self._model.MISSING
+            if field.factory is not None:
+                return [field.factory() if record[index] is missing else record[index] for record in self._records]
+            return [field.default if record[index] is missing else record[index] for record in self._records]
+        return [getattr(item, name, None) for item in self._items.values()]
+
+    @property
+    def edited(self) -> bool:
+        """Whether any built object has a local edit not yet written back, compact records never do"""
+        return self._items is not None and any(item.dirty_fields for item in self._items.values())
+
+    def evict(self, idle: float) -> bool:
+        """Packs the objects back into records when unused for ``idle`` seconds and none has an unsaved edit"""
+        if self._items is None or monotonic() - self.last_used < idle:
+            return False
+        if self.edited:
+            return False
+        self._records = [item.to_record() for item in self._items.values()]
+        self._items = None
+        return True
@@ -0,0 +1,103 @@
+import bisect
+import collections
+import itertools
+import typing
+from time import monotonic
+
+
+class Leaderboard:
+    """Scores kept in descending order next to a key -> score map, so any top k is a slice away
+
+    Ties go to whichever key reached its score first. The order never compares keys, which may be of mixed types.
+    """
+    __slots__ = ("_scores", "_order", "_entries", "_counter", "total")
+
+    def __init__(self, scores: typing.Mapping = None):
+        self._scores: typing.Dict[typing.Any, int] = {}
+        self._order: typing.List[typing.Tuple[int, int, typing.Any]] = []
+        # key -> its (-score, sequence, key) entry in _order, the sequence number breaks ties
+        self._entries: typing.Dict[typing.Any, typing.Tuple[int, int, typing.Any]] = {}
+        self._counter = itertools.count()
+        self.total = 0
+        if scores:
+            self._scores = {key: score for key, score in scores.items()}
+            self._entries = {key: (-score, next(self._counter), key) for key, score in self._scores.items()}
+            self._order = sorted(self._entries.values())
+            self.total = sum(self._scores.values())
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, key):
+        return key in self._scores
+
+    def __getitem__(self, key) -> int:
+        return self._scores.get(key, 0)
+
+    def remove(self, key):
+        score = self._scores.pop(key, None)
+        if score is None:
+            return
+        index = bisect.bisect_left(self._order, self._entries.pop(key))
+        del self._order[index]
+        self.total -= score
+
+    def set(self, key, score: int):
+        self.remove(key)
+        self._scores[key] = score
+        entry = self._entries[key] = (-score, next(self._counter), key)
+        bisect.insort(self._order, entry)
+        self.total += score
+
+    def add(self, key, amount: int = 1):
+        self.set(key, self._scores.get(key, 0) + amount)
+
+    def top(self, k: int = 3) -> typing.List[typing.Tuple[typing.Any, int]]:
+        return [(key, -score) for score, _, key in self._order[:k]]
+
+
+class TagStats:
+    """A guild's tag leaderboards, updated as tags are called, created and deleted
+
+    Top tags and top creators come from the guild's own tags. Top users come from the backend's tagboard, which
+    is re-read in the background once the boards are older than ``RECONCILE_INTERVAL``.
+    """
+    RECONCILE_INTERVAL = 3600
+
+    __slots__ = ("tags", "creators", "users", "member_calls", "reconciled_at")
+
+    def __init__(self):
+        self.tags = Leaderboard()
+        self.creators = Leaderboard()
+        self.users = Leaderboard()
+        self.member_calls: typing.Dict[int, typing.Counter[str]] = {}
+        self.reconciled_at = 0.0
+
+    @property
+    def stale(self) -> bool:
+        return monotonic() - self.reconciled_at > self.RECONCILE_INTERVAL
+
+    def reconcile(self, tags: typing.Iterable, creators: typing.Mapping[int, int], tagboard: dict):
+        """Rebuilds every board from the guild's tags and a ``{member: {tag title: calls}}`` tagboard payload"""
+        self.tags = Leaderboard({tag.title: tag.count or 0 for tag in tags})
+        self.creators = Leaderboard(creators)
+        self.member_calls = {int(member): collections.Counter(calls) for member, calls in (tagboard or {}).items()}
+        self.users = Leaderboard({member: sum(calls.values()) for member, calls in self.member_calls.items()})
+        self.reconciled_at = monotonic()
+
+    def record_call(self, user: int, tag, alias=None):
+        if alias is None:
+            self.tags.add(tag.title)
+        self.users.add(user)
+        self.member_calls.setdefault(user, collections.Counter())[tag.title] += 1
+
+    def tag_created(self, tag):
+        self.tags.set(tag.title, tag.count or 0)
+        self.creators.add(tag.author)
+
+    def tag_deleted(self, tag):
+        self.tags.remove(tag.title)
+        if self.creators[tag.author] <= 1:
+            self.creators.remove(tag.author)
+        else:
+            self.creators.add(tag.author, -1)
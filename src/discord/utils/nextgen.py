@@ -1,26 +1,63 @@
 import asyncio
+import collections
 import datetime
+import functools
+import hashlib
+import inspect
+import itertools
 import logging
+import math
+import random
+import re
+import types
 import typing
 import ujson
+import urllib.parse
+from time import monotonic
 
 import aiohttp
 import dateutil.parser
 from aiohttp import ClientSession
 
 from src.discord.utils import time
+from src.discord.utils.activityroles import ActivityRoles
+from src.discord.utils.cache import TTLCache
+from src.discord.utils.contentstore import Body, ContentStore
+from src.discord.utils.journal import TimerJournal
+from src.discord.utils.lazy import LazyCollection
+from src.discord.utils.scheduler import TimerScheduler
+from src.discord.utils.leaderboard import TagStats
+from src.discord.utils.prefixes import PrefixMatcher
+from src.discord.utils.tagindex import TagIndex
+from src.discord.utils.telemetry import TelemetryPipeline
 from src.discord.utils.permissions import *
 
 
+# The exact shapes the backend emits, eg 2018-05-01T12:30:45.123456Z, 2018-05-01 12:30:45+00:00 or 2018-05-01
+ISO_8601 = re.compile(r"(\d{4})-(\d\d)-(\d\d)"
+                      r"(?:[T ](\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,6})\d*)?)?)?"
+                      r"(?:Z|[+-]\d\d(?::?\d\d)?)?$")
+
+
 def parse_date(arg):
     if isinstance(arg, datetime.datetime):
         return arg
     if not arg:
         return
+    # Like the dateutil path below, any UTC offset is dropped rather than applied
+    match = ISO_8601.match(arg) if isinstance(arg, str) else None
+    if match is not None:
+        year, month, day, hour, minute, second, fraction = match.groups()
+        try:
+            return datetime.datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                                     int(second or 0), int(fraction.ljust(6, "0")) if fraction else 0)
+        except ValueError:
+            pass
     try:
         data = dateutil.parser.parse(arg)
         return data.replace(tzinfo=None)
-    except:
+    except (ValueError, OverflowError, TypeError, AttributeError):
+        logging.getLogger("errors").warning(f"Unable to parse date {arg!r}")
         return
 
 
@@ -33,22 +70,251 @@ def parse_command_channels(arg):
         return arg
 
 
+_MISSING = object()
+
+# One store for the whole process so identical tag contents across guilds are held once
+TAG_CONTENT = ContentStore()
+
+
+class Field:
+    """Declares how a model attribute is read out of a backend payload
+
+    ``source`` names the payload keys to try in order, the first one present wins. ``default`` (``factory`` for
+    mutable defaults) is used when none of them are present and ``parser`` is applied to whatever was found.
+    ``public_name`` is what a private field is edited, serialised and dirty tracked as, through its property.
+    """
+    __slots__ = ("name", "sources", "public_name", "default", "factory", "parser")
+
+    def __init__(self, name: str, source: typing.Union[str, typing.Tuple[str, ...]] = None, default=None,
+                 factory: typing.Callable[[], typing.Any] = None, parser: typing.Callable = None):
+        self.name = name
+        source = source or name.lstrip("_")
+        self.sources = (source,) if isinstance(source, str) else tuple(source)
+        self.public_name = self.sources[0] if name.startswith("_") else name
+        self.default = default
+        self.factory = factory
+        self.parser = parser
+
+
+def _compile_loader(cls: type, fields: typing.Sequence[Field]) -> typing.Callable:
+    """Generates a straight line ``_load(self, data, dto)`` for a model's field spec
+
+    Slots are written through their descriptor's ``__set__``, bound once here, which skips both the dirty tracking
+    ``__setattr__`` and the attribute lookup ``object.__setattr__`` would do on every field. ``dto`` is assigned
+    last when given, which is what starts dirty tracking.
+    """
+    namespace = {"_set": object.__setattr__, "_MISSING": _MISSING}
+    lines = ["def _load(self, data, dto=_MISSING):", "    get = data.get"]
+    for index, field in enumerate(fields):
+        namespace[f"_default{index}"] = field.default
+        first, others = field.sources[0], field.sources[1:]
+        if field.factory is None and not others:
+            value = f"get({first!r}, _default{index})"
+        else:
+            lines.append(f"    value = get({first!r}, _MISSING)")
+            for source in others:
+                lines.append("    if value is _MISSING:")
+                lines.append(f"        value = get({source!r}, _MISSING)")
+            lines.append("    if value is _MISSING:")
+            if field.factory is not None:
+                namespace[f"_factory{index}"] = field.factory
+                lines.append(f"        value = _factory{index}()")
+            else:
+                lines.append(f"        value = _default{index}")
+            value = "value"
+        if field.parser is not None:
+            namespace[f"_parser{index}"] = field.parser
+            value = f"_parser{index}({value})"
+        descriptor = inspect.getattr_static(cls, field.name, None)
+        if isinstance(descriptor, types.MemberDescriptorType):
+            namespace[f"_set{index}"] = descriptor.__set__
+            lines.append(f"    _set{index}(self, {value})")
+        else:
+            lines.append(f"    _set(self, {field.name!r}, {value})")
+    lines += ["    if dto is not _MISSING:", "        _set(self, '_dto', dto)"]
+    exec("\n".join(lines), namespace)
+    return namespace["_load"]
+
+
+def _compile_serializer(names: typing.Sequence[str], loaded: typing.Set[str]) -> typing.Callable:
+    """Generates ``to_dict(self)``, keeping the truthy-only behaviour of the old reflective ``data``"""
+    lines = ["def to_dict(self):", "    data = {}"]
+    for name in names:
+        if name in loaded:
+            lines.append(f"    value = self.{name}")
+        else:
+            lines.append(f"    value = getattr(self, {name!r}, None)")
+        lines.append("    if value:")
+        lines.append(f"        data[{name!r}] = value")
+    lines.append("    return data")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["to_dict"]
+
+
+class CircuitBreaker:
+    """Stops calling a backend that keeps failing, then lets a single probe through after ``reset_timeout``"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    __slots__ = ("failure_threshold", "reset_timeout", "state", "failures", "trips", "_opened_at", "_probing")
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - monotonic())
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN and self.retry_after == 0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+        return self.state == self.CLOSED
+
+    def release(self):
+        self._probing = False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self._opened_at = monotonic()
+        self._probing = False
+
+
+class WriteBehind:
+    """Coalesces local edits to API objects and writes them back in periodic batches
+
+    Objects are keyed on their url so marking the same object many times between flushes costs one write
+    """
+    FLUSH_INTERVAL = 15
+    FLUSH_CONCURRENCY = 8
+
+    __slots__ = ("_dto", "_dirty", "_task", "writes", "coalesced")
+
+    def __init__(self, dto: "DiscordDto"):
+        self._dto = dto
+        self._dirty: typing.Dict[str, "API"] = {}
+        self._task: typing.Optional[asyncio.Task] = None
+        self.writes = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._dirty)
+
+    def mark(self, obj: "API"):
+        url = obj.url
+        if url in self._dirty:
+            self.coalesced += 1
+        self._dirty[url] = obj
+        if self._task is None or self._task.done():
+            self._task = self._dto._bot.loop.create_task(self._run())
+
+    async def _run(self):
+        while self._dirty:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self.flush()
+
+    async def _write(self, semaphore: asyncio.Semaphore, url: str, obj: "API", retry: bool):
+        async with semaphore:
+            try:
+                response = await obj.update()
+            except asyncio.CancelledError:
+                # Counters are absolute values so writing this object again later is harmless
+                self._dirty.setdefault(url, obj)
+                raise
+            except Exception:
+                self._dto._bot.error_logger.exception(f"Write behind failed on url : {url}")
+                response = False
+        self.writes += 1
+        if not response and retry:
+            # A newer edit to the same object may already be waiting, that one wins
+            self._dirty.setdefault(url, obj)
+
+    async def flush(self, retry: bool = True):
+        batch, self._dirty = self._dirty, {}
+        semaphore = asyncio.Semaphore(self.FLUSH_CONCURRENCY)
+        await asyncio.gather(*[self._write(semaphore, url, obj, retry) for url, obj in batch.items()])
+
+    async def drain(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush(retry=False)
+
+
 class DiscordDto:
     POST_URL = ""
     PRIMARY_KEY = "id"
     IGNORED_FIELDS = ("member", "author", "blocker", "user")
-
-    __slots__ = ("_bot", "_token", "_base_url", "_reminders", "_all_reminders")
+    CONNECTION_LIMIT = 100
+    CONNECTION_LIMIT_PER_HOST = 30
+    DNS_CACHE_TTL = 300
+    PAGE_CONCURRENCY = 4
+    CACHE_SIZE = 10000
+    CACHE_TTL = 0
+    REQUEST_TIMEOUT = 10
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.25
+    RETRY_BACKOFF_CAP = 4
+    IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE"))
+    GUILD_SYNC_CONCURRENCY = 10
+    GUILD_BULK_CHUNK = 100
+    UPSERT_CHUNK = 250
+
+    __slots__ = ("_bot", "_token", "_base_url", "_reminders", "_all_reminders", "_session", "_write_behind",
+                 "_telemetry", "_cache", "_inflight", "_stats", "_breaker", "_timers", "_firing", "_journal")
 
     def __init__(self, bot):
         self._bot: "Iceteabot" = bot
         self._token: str = bot.config['api_keys']['iceteacity']
         self._base_url: str = bot.base_url
         self._reminders: typing.Dict[int: Reminder] = {}
+        self._session: typing.Optional[ClientSession] = None
+        self._write_behind = WriteBehind(self)
+        self._telemetry = TelemetryPipeline(self)
+        self._cache = TTLCache(self.CACHE_SIZE)
+        self._inflight: typing.Dict[str, asyncio.Task] = {}
+        self._stats: typing.Counter[str] = collections.Counter()
+        self._breaker = CircuitBreaker()
+        self._timers = TimerScheduler(bot.loop)
+        self._firing: typing.Set[int] = set()
+        self._journal = TimerJournal(bot.loop)
 
     def __eq__(self, other):
         return getattr(self, self.PRIMARY_KEY, None) == other
 
+    @property
+    def dto(self) -> "DiscordDto":
+        try:
+            return self._dto
+        except AttributeError:
+            return self
+
     @property
     def bot(self) -> "Iceteabot":
         try:
@@ -70,6 +336,50 @@ class DiscordDto:
         except AttributeError:
             return self._base_url
 
+    @property
+    def session(self) -> ClientSession:
+        """The keep-alive session shared by every object of this bot, created on first use"""
+        dto = self.dto
+        if dto._session is None or dto._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.CONNECTION_LIMIT,
+                                             limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                                             use_dns_cache=True,
+                                             ttl_dns_cache=self.DNS_CACHE_TTL,
+                                             loop=dto._bot.loop)
+            dto._session = ClientSession(loop=dto._bot.loop,
+                                         connector=connector,
+                                         headers={"Authorization": f"Token {dto._token}"},
+                                         json_serialize=ujson.dumps)
+        return dto._session
+
+    @property
+    def write_behind(self) -> WriteBehind:
+        return self.dto._write_behind
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self.dto._breaker
+
+    @property
+    def timers(self) -> TimerScheduler:
+        return self.dto._timers
+
+    @property
+    def journal(self) -> TimerJournal:
+        return self.dto._journal
+
+    @property
+    def stats(self) -> typing.Counter[str]:
+        return self.dto._stats
+
+    @property
+    def cache(self) -> TTLCache:
+        return self.dto._cache
+
+    @property
+    def telemetry(self) -> TelemetryPipeline:
+        return self.dto._telemetry
+
     @property
     def logger(self):
         return self.bot.error_logger
@@ -85,6 +395,9 @@ class DiscordDto:
 
     @property
     def data(self) -> dict:
+        return self.to_dict()
+
+    def to_dict(self) -> dict:
         response_data = {}
         for attr in self.__slots__:
             if not attr.startswith("_"):
@@ -93,50 +406,308 @@ class DiscordDto:
                     response_data[attr] = data
         return response_data
 
-    async def fetch_data(self, url: str, base_url: str = None, data: dict = None) \
-            -> typing.Union[typing.Dict, typing.List]:
-        return_data = []
-        if url:
-            full_url = f"{self.bot.base_url}{url}"
+    @classmethod
+    def from_dict(cls, dto: "DiscordDto", data: dict) -> "DiscordDto":
+        return cls(dto, **data)
+
+    async def _send(self, method: str, url: str, **kwargs) -> typing.Tuple[int, typing.Any]:
+        self.stats["requests"] += 1
+        async with self.session.request(method, url, **kwargs) as response:
+            if response.content_type == "application/json":
+                payload = await response.json(loads=ujson.loads)
+            else:
+                payload = await response.text()
+            return response.status, payload
+
+    async def request(self, method: str, url: str, *, timeout: float = None, **kwargs) \
+            -> typing.Tuple[int, typing.Any]:
+        """Sends a request over the shared session and returns the status and the decoded body
+
+        The whole call, retries included, must finish within ``timeout`` seconds. Idempotent verbs are retried
+        with jittered exponential backoff on connection errors, timeouts and 5xx responses. Raises
+        :class:`BackendUnavailable` when the circuit breaker is open or the last attempt still had no response or
+        a 5xx one. Every way out of the call reports to the breaker, so a probe can never stay outstanding.
+        """
+        breaker = self.breaker
+        if not breaker.allow():
+            self.stats["rejected"] += 1
+            raise BackendUnavailable(breaker.retry_after)
+        loop = self.bot.loop
+        deadline = loop.time() + (timeout or self.REQUEST_TIMEOUT)
+        attempts = self.MAX_RETRIES + 1 if method in self.IDEMPOTENT_METHODS else 1
+        settled = False
+        try:
+            for attempt in range(attempts):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    status, payload = await asyncio.wait_for(self._send(method, url, **kwargs), remaining, loop=loop)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    status, payload = None, None
+                if status is not None and status < 500:
+                    breaker.record_success()
+                    settled = True
+                    return status, payload
+                if attempt + 1 < attempts:
+                    self.stats["retries"] += 1
+                    backoff = random.uniform(0, min(self.RETRY_BACKOFF_CAP, self.RETRY_BACKOFF * 2 ** attempt))
+                    await asyncio.sleep(min(backoff, max(0, deadline - loop.time())), loop=loop)
+            self.stats["failed"] += 1
+        except asyncio.CancelledError:
+            # A cancelled probe never reports back, let the next caller probe instead
+            breaker.release()
+            settled = True
+            raise
+        finally:
+            if not settled:
+                breaker.record_failure()
+        raise BackendUnavailable(breaker.retry_after)
+
+    @property
+    def health(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Snapshot of the persistence layer's moving parts, shown by the health command"""
+        dto = self.dto
+        return {
+            "Backend": {"state": dto._breaker.state, "failures": dto._breaker.failures,
+                        "trips": dto._breaker.trips, "retry after": round(dto._breaker.retry_after, 1)},
+            "Requests": dict(dto._stats),
+            "Cache": {"size": len(dto._cache), "hits": dto._cache.hits, "misses": dto._cache.misses,
+                      "hit rate": f"{dto._cache.hit_rate:.0%}"},
+            "Write behind": {"pending": len(dto._write_behind), "writes": dto._write_behind.writes,
+                             "coalesced": dto._write_behind.coalesced},
+            "Telemetry": {"buffered": len(dto._telemetry), "sent": dto._telemetry.sent,
+                          "spilled": dto._telemetry.spilled, "dropped": dto._telemetry.dropped,
+                          "rejected": dto._telemetry.rejected},
+            "Tag content": TAG_CONTENT.stats,
+            "Timers": {"pending": len(dto._timers), "fired": dto._timers.fired, "next due": dto._timers.next_due},
+            "Timer journal": dto._journal.stats,
+        }
+
+    async def close(self):
+        dto = self.dto
+        await dto._write_behind.drain()
+        await dto._telemetry.drain()
+        if dto._session is not None and not dto._session.closed:
+            await dto._session.close()
+        dto._session = None
+        dto._journal.close()
+
+    @staticmethod
+    def _is_page(payload) -> bool:
+        return isinstance(payload, dict) and "results" in payload
+
+    @staticmethod
+    def _remaining_pages(next_page: str, count: int = None, page_size: int = None) -> typing.Optional[list]:
+        """Works out every remaining page url from the first ``next`` link, None when the paging scheme is unknown"""
+        if not count or not page_size:
+            return None
+        parts = urllib.parse.urlsplit(next_page)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+
+        def page_url(**changes):
+            return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(dict(query, **changes))))
+
+        try:
+            if "page" in query:
+                last_page = math.ceil(count / page_size)
+                return [page_url(page=page) for page in range(int(query['page']), last_page + 1)]
+            elif "offset" in query:
+                limit = int(query.get("limit", page_size))
+                return [page_url(offset=offset) for offset in range(int(query['offset']), count, limit)]
+        except ValueError:
+            return None
+
+    async def _fetch_page(self, url: str, data: dict = None):
+        """The decoded page, None only when the backend says it does not exist (404)
+
+        Any other failure raises :class:`BackendUnavailable`, so callers never mistake an error for a missing object
+        """
+        status, payload = await self.request("GET", url, params=data)
+        if status == 200:
+            return payload
+        if status == 404:
+            return None
+        self.logger.error(f"Fetching {url} failed with response : {status}")
+        raise BackendUnavailable()
+
+    async def _get_page(self, url: str, data: dict = None):
+        """GETs a page, concurrent callers asking for the same url and params share one request"""
+        dto = self.dto
+        key = f"{url}?{urllib.parse.urlencode(sorted(data.items()))}" if data else url
+        inflight = dto._inflight.get(key)
+        if inflight is not None:
+            dto._stats["collapsed"] += 1
         else:
-            full_url = base_url
-        next_page = None
-        async with ClientSession(loop=self.bot.loop,
-                                 headers={"Authorization": f"Token {self.token}"},
-                                 json_serialize=ujson.dumps) as session:
-            async with session.get(f"{full_url}", params=data) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if "results" in data:
-                        return_data.extend(data['results'])
-                        if data.get("next") is not None:
-                            next_page = data['next']
-                    else:
-                        return data
-        if next_page is not None:
-            return_data.extend(await self.fetch_data(url, base_url=next_page))
-        return return_data
+            inflight = dto._inflight[key] = self.bot.loop.create_task(self._fetch_page(url, data))
+            inflight.add_done_callback(lambda _: dto._inflight.pop(key, None))
+        # Shielded so one waiter giving up does not cancel the request for everyone else
+        return await asyncio.shield(inflight)
+
+    async def _iter_pages(self, first_page: dict, concurrency: int = None, strict: bool = False):
+        for record in first_page['results']:
+            yield record
+        next_page = first_page.get("next")
+        if next_page is None:
+            return
+        concurrency = concurrency or self.PAGE_CONCURRENCY
+        page_urls = self._remaining_pages(next_page, first_page.get("count"), len(first_page['results']))
+        if page_urls is None or concurrency <= 1:
+            while next_page is not None:
+                page = await self._get_page(next_page)
+                if not self._is_page(page):
+                    if strict:
+                        raise BackendUnavailable()
+                    return
+                for record in page['results']:
+                    yield record
+                next_page = page.get("next")
+            return
+        # Keep a window of requests in flight but hand out records in page order
+        page_urls = iter(page_urls)
+        pending = collections.deque(self.bot.loop.create_task(self._get_page(page_url))
+                                    for page_url in itertools.islice(page_urls, concurrency))
+        try:
+            while pending:
+                page = await pending.popleft()
+                page_url = next(page_urls, None)
+                if page_url is not None:
+                    pending.append(self.bot.loop.create_task(self._get_page(page_url)))
+                if self._is_page(page):
+                    for record in page['results']:
+                        yield record
+                elif strict:
+                    raise BackendUnavailable()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_data(self, url: str, base_url: str = None, data: dict = None, concurrency: int = None,
+                        strict: bool = False) -> typing.AsyncIterator[typing.Dict]:
+        """Yields records from an endpoint as their pages arrive, following DRF style ``next`` links.
+
+        Once the first page has told us the ``count`` the remaining pages are fetched ``concurrency`` at a time.
+        Pages that are missing or not pages are skipped, unless ``strict`` where they raise
+        :class:`BackendUnavailable` so the caller knows the listing is incomplete.
+        """
+        full_url = f"{self.bot.base_url}{url}" if url else base_url
+        payload = await self._get_page(full_url, data)
+        if strict and payload is None:
+            raise BackendUnavailable()
+        if self._is_page(payload):
+            async for record in self._iter_pages(payload, concurrency, strict):
+                yield record
+        elif isinstance(payload, list):
+            for record in payload:
+                yield record
+        elif payload:
+            yield payload
+
+    async def fetch_data(self, url: str, base_url: str = None, data: dict = None, concurrency: int = None) \
+            -> typing.Union[typing.Dict, typing.List]:
+        full_url = f"{self.bot.base_url}{url}" if url else base_url
+        payload = await self._get_page(full_url, data)
+        if self._is_page(payload):
+            return [record async for record in self._iter_pages(payload, concurrency)]
+        return payload if payload is not None else []
 
     async def get(self, obj: "DiscordDto()", post_data: dict = None, create: bool = False, **kwargs) -> "API()":
         post_data = post_data or {}
         try:
             url = obj.POST_URL.format_map(kwargs)
+            # Filtered lookups (post_data) are not identity mapped, only plain object urls are
+            cacheable = obj.CACHE_TTL and not post_data
+            if cacheable:
+                cached = self.cache.get(f"{self.base_url}{url}")
+                if cached is not None:
+                    return cached
             payload = await self.fetch_data(url, data=post_data)
             if payload:
-                return obj(getattr(self, "_dto", self), **payload)
+                # Lookup keys the payload leaves out (Member's discord_id) are kept so the object's url, and with it
+                # cache invalidation, matches the url it was cached under
+                new_obj = obj(self.dto, **dict(kwargs, **payload))
+                if cacheable:
+                    self.cache.set(f"{self.base_url}{url}", new_obj, obj.CACHE_TTL)
+                return new_obj
             else:
                 raise KeyError
         except KeyError:
             if create:
                 post_data.update(kwargs)
-                new_obj = obj(getattr(self, "_dto", self), **post_data)
+                new_obj = obj(self.dto, **post_data)
                 response = await new_obj.save()
                 if response:
                     return new_obj
 
     async def get_all(self, obj: "DiscordDto()", post_data: dict = None, **kwargs):
-        payload = await self.fetch_data(url=obj.purl(self.base_url, **kwargs), data=post_data)
-        return [obj(self, **data) for data in payload]
+        return [obj(self.dto, **data) async for data in
+                self.iter_data(None, base_url=obj.purl(self.base_url, **kwargs), data=post_data)]
+
+    async def _upsert_one(self, semaphore: asyncio.Semaphore, obj: "API") -> bool:
+        async with semaphore:
+            return await (obj.update() if obj.dirty_fields else obj.save())
+
+    async def bulk_upsert(self, objects: typing.Sequence["API"], url: str) -> int:
+        """Creates or updates many objects with ``UPSERT_CHUNK`` sized ``{"data": [...]}`` POSTs to ``url``
+
+        Chunks the backend will not take in bulk fall back to one save (new objects) or update (objects with
+        dirty fields) each. Returns how many objects were written.
+        """
+        written = 0
+        for index in range(0, len(objects), self.UPSERT_CHUNK):
+            chunk = objects[index:index + self.UPSERT_CHUNK]
+            try:
+                status, payload = await self.request("POST", url, json={"data": [obj.data for obj in chunk]})
+            except BackendUnavailable as e:
+                self.logger.error(f"Bulk upsert to {url} failed : {e}")
+                continue
+            if status in [200, 201, 204]:
+                for obj in chunk:
+                    obj.dirty_fields.clear()
+                    obj.invalidate()
+                written += len(chunk)
+            else:
+                self.logger.error(f"Bulk upsert to {url} failed with response : {status}, writing one by one")
+                semaphore = asyncio.Semaphore(WriteBehind.FLUSH_CONCURRENCY)
+                results = await asyncio.gather(*[self._upsert_one(semaphore, obj) for obj in chunk])
+                written += sum(1 for result in results if result)
+        return written
+
+    async def _load_guild(self, semaphore: asyncio.Semaphore, guild_id: int) -> typing.Optional["Guild"]:
+        async with semaphore:
+            return await self.get(Guild, guild=guild_id, create=True)
+
+    async def hydrate_guilds(self, guild_ids: typing.Iterable[int], bulk: bool = False,
+                             concurrency: int = None) -> typing.AsyncIterator["Guild"]:
+        """Yields each guild's data as soon as it has loaded, in no particular order
+
+        With ``bulk`` the guilds are first requested ``GUILD_BULK_CHUNK`` ids at a time from the list endpoint,
+        anything it did not return is then fetched (or created) one by one, ``concurrency`` at a time.
+        """
+        remaining = set(guild_ids)
+        if bulk:
+            ordered = list(remaining)
+            for index in range(0, len(ordered), self.GUILD_BULK_CHUNK):
+                chunk = ordered[index:index + self.GUILD_BULK_CHUNK]
+                async for payload in self.iter_data("guilds", data={"ids": ",".join(map(str, chunk))}):
+                    guild_id = payload.get("guild")
+                    if guild_id in remaining:
+                        remaining.discard(guild_id)
+                        yield Guild(self.dto, **payload)
+        semaphore = asyncio.Semaphore(concurrency or self.GUILD_SYNC_CONCURRENCY)
+        tasks = [self.bot.loop.create_task(self._load_guild(semaphore, guild_id)) for guild_id in remaining]
+        try:
+            for future in asyncio.as_completed(tasks, loop=self.bot.loop):
+                try:
+                    guild = await future
+                except BackendUnavailable as e:
+                    self.logger.error(f"Unable to load a guild : {e}")
+                    continue
+                if guild is not None:
+                    yield guild
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def get_guild_data(self, guild_id) -> typing.Optional["Guild"]:
         payload = await self.fetch_data(f"guilds/{guild_id}")
@@ -150,120 +721,308 @@ class DiscordDto:
         payload = await self.fetch_data(f"commands/{name}")
         return Command(self, **payload)
 
+    async def add_reminder(self, **kwargs) -> typing.Optional["Reminder"]:
+        """Creates and schedules a reminder, short ones only cost a journal append (see ``Reminder.start``)"""
+        reminder = Reminder(self, **kwargs)
+        if reminder.delta is None:
+            return None
+        await reminder.start(create=True)
+        return reminder
+
+    def schedule_reminder(self, reminder: "Reminder"):
+        self._reminders[reminder.id] = reminder
+        self._journal.record("reminder", reminder.id, reminder.to_payload())
+        self._timers.schedule(("reminder", reminder.id), reminder.delta, functools.partial(self._fire, reminder))
+
+    def local_reminders(self, user: int) -> typing.List["Reminder"]:
+        """A user's pending reminders that only live in the timer journal"""
+        return [reminder for reminder in self._reminders.values() if reminder.short and reminder.user == user]
+
+    def replay_timers(self) -> int:
+        """Reschedules every timer the journal holds, before and without reading anything from the backend"""
+        try:
+            pending = self._journal.replay()
+        except OSError:
+            self.logger.exception("Unable to replay the timer journal")
+            self._journal.mark_replayed()
+            return 0
+        replayed = 0
+        for kind, timer_id, data in pending:
+            if kind == "reminder":
+                reminder = Reminder(self, **data)
+                reminder.short = timer_id < 0
+                self.schedule_reminder(reminder)
+                replayed += 1
+            else:
+                # Nothing handles other kinds any more (scheduled commands were journaled once), let them go
+                self._journal.forget(kind, timer_id)
+        return replayed
+
+    def _fire(self, reminder: "Reminder"):
+        """Hands a due reminder to its event exactly once, the backend copy is deleted right after"""
+        if self._reminders.pop(reminder.id, None) is None:
+            return
+        self._journal.forget("reminder", reminder.id)
+        self._bot.dispatch(reminder.event, reminder)
+        if not reminder.short:
+            self._firing.add(reminder.id)
+            self._bot.loop.create_task(self._forget(reminder))
+
+    async def _forget(self, reminder: "Reminder"):
+        try:
+            await reminder.delete()
+        finally:
+            self._firing.discard(reminder.id)
+
     async def get_all_reminders(self):
+        """Keeps the scheduler in step with the backend's reminders, streaming them in page by page
+
+        The journal's timers are replayed first, as soon as the bot can see its channels.
+        """
+        await self._bot.wait_until_ready()
+        self.replay_timers()
         await self._bot.wait_for_database.wait()
         while not self._bot.is_closed():
-            self._reminders.clear()
-            reminders = await self.fetch_data("reminders")
-            for reminder in reminders:
-                r = Reminder(self, **reminder)
-                self._reminders[r.id] = r
-                self._bot.loop.create_task(r.start())
+            try:
+                await self._sync_reminders()
+            except BackendUnavailable as e:
+                self.logger.warning(f"Reminder sync skipped : {e}")
+            except Exception:
+                self.logger.exception("Reminder sync failed")
             await asyncio.sleep(300)
 
+    async def _sync_reminders(self):
+        seen = set()
+        async for payload in self.iter_data("reminders", strict=True):
+            reminder = Reminder(self, **payload)
+            if reminder.id is None or reminder.delta is None or reminder.id in self._firing:
+                continue
+            seen.add(reminder.id)
+            current = self._reminders.get(reminder.id)
+            if current is None or current.delta != reminder.delta:
+                self.schedule_reminder(reminder)
+        # Only reached once every page loaded, a partial listing would cancel reminders that still exist.
+        # Reminders deleted elsewhere since the last pass go, the journal's own are never on the backend
+        for rid in [rid for rid, reminder in self._reminders.items() if rid not in seen and not reminder.short]:
+            self._reminders.pop(rid).cancel()
+
     async def delete_reminder(self, rid):
         reminder: Reminder = self._reminders.pop(rid, None)
         if reminder:
             reminder.cancel()
-            await reminder.delete()
+            if not reminder.short:
+                await reminder.delete()
             return reminder
 
     async def cancel_reminders(self):
-        for reminders in self._reminders.values():
-            for r in reminders:
-                r.cancel()
+        self._timers.stop()
 
 
 class API(DiscordDto):
-    async def update(self, url=None) -> bool:
-        async with aiohttp.ClientSession(
-                headers={"Authorization": f"Token {self.token}"},
-                json_serialize=ujson.dumps) as session:
-            async with session.put(data=self.data, url=url or self.url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    for attr in data:
-                        if attr not in self.IGNORED_FIELDS:
-                            setattr(self, attr, data[attr])
-                    return True
-                else:
-                    self.logger.error(
-                        f"Update Failed on object: {self.__class__.__name__}  with response : {response.status}",
-                        exc_info=True)
-                    return False
+    FIELDS: typing.Tuple[Field, ...] = ()
+    # Marks the fields a compact record's payload did not carry
+    MISSING = _MISSING
+    _tracked: typing.FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Built once per model so constructing and serialising objects never reflects over __slots__
+        fields = cls.__dict__.get("FIELDS", ())
+        cls._load = _compile_loader(cls, fields)
+        names = [name for name in cls.__slots__ if not name.startswith("_")]
+        # Private fields exposed through a property of their public name are serialised and tracked under it
+        names += [field.public_name for field in fields
+                  if field.name.startswith("_") and isinstance(getattr(cls, field.public_name, None), property)]
+        cls._tracked = frozenset(names)
+        cls.to_dict = _compile_serializer(names, {field.name for field in fields})
+
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        if not key.startswith("_") and key in self._tracked:
+            # Every constructor assigns _dto last, anything assigned after that is a local edit
+            try:
+                object.__getattribute__(self, "_dto")
+            except AttributeError:
+                return
+            self.dirty_fields.add(key)
+
+    @property
+    def dirty_fields(self) -> typing.Set[str]:
+        """Fields changed locally since the object was last synced with the backend"""
+        try:
+            return object.__getattribute__(self, "_dirty")
+        except AttributeError:
+            dirty = set()
+            object.__setattr__(self, "_dirty", dirty)
+            return dirty
+
+    def _apply(self, payload: dict, existing_only: bool = False):
+        """Copies a backend response onto the object without marking anything dirty"""
+        dirty = self.dirty_fields
+        for attr in payload:
+            if attr in self.IGNORED_FIELDS or attr in dirty:
+                # Edited again while the request was in flight, the local value is newer
+                continue
+            if existing_only and not hasattr(self, attr):
+                continue
+            object.__setattr__(self, attr, payload[attr])
+
+    def refresh(self, payload: dict):
+        """Loads the fields a (partial) backend payload carries, parsed as the constructor would, keeping local edits"""
+        fresh = self.__class__.__new__(self.__class__)
+        fresh._load(payload)
+        dirty = self.dirty_fields
+        for field in self.FIELDS:
+            if field.public_name not in dirty and any(source in payload for source in field.sources):
+                object.__setattr__(self, field.name, getattr(fresh, field.name))
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, Body):
+            return TAG_CONTENT.peek(value)
+        return value
+
+    @classmethod
+    def compact(cls, payload: dict) -> tuple:
+        """Packs a payload into a tuple in ``FIELDS`` order, much smaller than the dict or a built object"""
+        record = []
+        for field in cls.FIELDS:
+            value = _MISSING
+            for source in field.sources:
+                if source in payload:
+                    value = payload[source]
+                    break
+            record.append(value)
+        return tuple(record)
+
+    @classmethod
+    def expand(cls, record: tuple) -> dict:
+        return {field.sources[0]: value for field, value in zip(cls.FIELDS, record) if value is not _MISSING}
+
+    @classmethod
+    def export(cls, record: tuple) -> dict:
+        """A compact record as a json ready payload"""
+        return {key: cls._serialize(value) for key, value in cls.expand(record).items()}
+
+    def to_record(self) -> tuple:
+        """Packs a loaded object straight back into a compact record, the loader's parsers accept their output"""
+        return tuple(getattr(self, field.name, None) for field in self.FIELDS)
+
+    def to_payload(self) -> dict:
+        """The object in the shape the backend sends it, so ``cls(dto, **payload)`` rebuilds it"""
+        return {field.sources[0]: self._serialize(getattr(self, field.name, None)) for field in self.FIELDS}
+
+    def invalidate(self):
+        """Drops this object's url from the read through cache"""
+        try:
+            self.cache.invalidate(self.url)
+        except (KeyError, IndexError):
+            pass
+
+    def increment(self, field: str, amount: int = 1):
+        """Bumps a counter locally and leaves the backend write to the write behind queue"""
+        setattr(self, field, (getattr(self, field, None) or 0) + amount)
+        self.write_behind.mark(self)
+
+    async def update(self, url=None, full: bool = False) -> bool:
+        """Writes local edits back, as a PATCH of the dirty fields or a PUT of everything when ``full``"""
+        dirty = self.dirty_fields
+        if not dirty and not full:
+            return True
+        fields = set(dirty)
+        dirty.clear()
+        self.invalidate()
+        try:
+            if full:
+                status, payload = await self.request("PUT", url or self.url, data=self.data)
+            else:
+                body = {field: self._serialize(getattr(self, field, None)) for field in fields}
+                status, payload = await self.request("PATCH", url or self.url, json=body)
+                if status == 405:
+                    status, payload = await self.request("PUT", url or self.url, data=self.data)
+        except BackendUnavailable as e:
+            dirty.update(fields)
+            self.logger.error(f"Update Failed on object: {self.__class__.__name__} : {e}")
+            return False
+        if status == 200:
+            if isinstance(payload, dict):
+                self._apply(payload)
+            return True
+        else:
+            dirty.update(fields)
+            self.logger.error(
+                f"Update Failed on object: {self.__class__.__name__}  with response : {status}",
+                exc_info=True)
+            return False
 
     async def save(self, url=None) -> bool:
-        async with aiohttp.ClientSession(
-                headers={"Authorization": f"Token {self.token}"},
-                json_serialize=ujson.dumps) as session:
-            async with session.post(data=self.data, url=url or self.purl(self.base_url, **self.data)) as response:
-                if response.status in [200, 201, 204]:
-                    if getattr(self, self.PRIMARY_KEY, None) is None:
-                        data = await response.json()
-                        setattr(self, self.PRIMARY_KEY, data.get(self.PRIMARY_KEY, None))
-                        for attr in data:
-                            if hasattr(self, attr) and attr not in self.IGNORED_FIELDS:
-                                setattr(self, attr, data[attr])
-                    return True
-                else:
-                    message = await response.text()
-                    self.logger.error(
-                        f"Save Failed on object: {self.__class__.__name__}  "
-                        f"with response : {response.status} with message : {message}",
-                        exc_info=True)
-                    return False
+        try:
+            status, payload = await self.request("POST", url or self.purl(self.base_url, **self.data), data=self.data)
+        except BackendUnavailable as e:
+            self.logger.error(f"Save Failed on object: {self.__class__.__name__} : {e}")
+            return False
+        if status in [200, 201, 204]:
+            if getattr(self, self.PRIMARY_KEY, None) is None:
+                object.__setattr__(self, self.PRIMARY_KEY, payload.get(self.PRIMARY_KEY, None))
+                self._apply(payload, existing_only=True)
+            self.dirty_fields.clear()
+            self.invalidate()
+            return True
+        else:
+            self.logger.error(
+                f"Save Failed on object: {self.__class__.__name__}  "
+                f"with response : {status} with message : {payload}",
+                exc_info=True)
+            return False
 
     async def delete(self, url=None) -> bool:
-        async with aiohttp.ClientSession(
-                headers={"Authorization": f"Token {self.token}"},
-                json_serialize=ujson.dumps) as session:
-            async with session.delete(url=url or self.url) as response:
-                if response.status in [200, 201, 204]:
-                    return True
-                elif response.status == 404:
-                    return True
-                else:
-                    try:
-                        self.logger.error(
-                            f"Delete Failed on object: {self.__class__.__name__} on url : {url} "
-                            f" with response : {response.status}",
-                            exc_info=True)
-                    except aiohttp.ClientResponseError as e:
-                        self.logger.exception(e)
-                    return False
+        self.invalidate()
+        if url is not None:
+            self.cache.invalidate(url)
+        try:
+            status, payload = await self.request("DELETE", url or self.url)
+        except BackendUnavailable as e:
+            self.logger.error(f"Delete Failed on object: {self.__class__.__name__} : {e}")
+            return False
+        if status in [200, 201, 204]:
+            return True
+        elif status == 404:
+            return True
+        else:
+            self.logger.error(
+                f"Delete Failed on object: {self.__class__.__name__} on url : {url} "
+                f" with response : {status}",
+                exc_info=True)
+            return False
 
 
 class Reminder(API):
     __slots__ = (
-        "id", "user", "message", "timestamp", "channel", "event", "delta", "private", "expires", "_task", "_short")
+        "id", "user", "message", "timestamp", "channel", "event", "delta", "private", "expires", "_short")
 
     POST_URL = "users/{user}/reminders/{id}"
+    SHORT_FOR = 300
+    FIELDS = (
+        Field("id"),
+        Field("user", source=("discord_id", "user")),
+        Field("message"),
+        Field("timestamp", parser=parse_date),
+        Field("channel"),
+        Field("event"),
+        Field("delta", parser=parse_date),
+        Field("private", default=False),
+        Field("expires", parser=parse_date),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)
-        self.user = kwargs.pop('discord_id', None)
-        self.message = kwargs.pop('message', None)
-        self.timestamp = parse_date(kwargs.pop('timestamp', None))
-        self.channel = kwargs.pop('channel', None)
-        self.event = kwargs.pop('event', None)
-        self.delta = parse_date(kwargs.pop('delta', None))
-        self.private = kwargs.pop("private", False)
-        self.expires = parse_date(kwargs.pop('expires', None))
-        self._task = None  # type: asyncio.Task
         self._short = False
-        self._dto = dto
+        self._load(kwargs, dto)
 
     def __hash__(self):
         return hash(self.id)
 
-    @property
-    def task(self):
-        return self._task
-
-    @task.setter
-    def task(self, value):
-        self._task = value
-
     @property
     def short(self):
         return self._short
@@ -277,106 +1036,91 @@ class Reminder(API):
         return time.human_timedelta(self.timestamp)
 
     async def start(self, create: bool = False):
-        delta = (self.delta - datetime.datetime.utcnow()).total_seconds()
-        if create and delta > 300:
-            await self.save()
-        else:
-            self.bot.loop.create_task(self._task_func())
-
-    async def _task_func(self):
-        if self.delta < datetime.datetime.utcnow():
-            return await self.delete()
-        difference = self.delta - datetime.datetime.utcnow()
-        await asyncio.sleep(difference.total_seconds())
-        self._dto.delete_reminder(self.id)
-        self.bot.dispatch(self.event, self)
+        """Schedules the reminder, saving it first with ``create``
 
-    def cancel(self):
-        if self.task:
-            return self.task.cancel()
-
-
-class ScheduledCommand:
-    __slots__ = ("_bot", "ctx", "command", "when", "_task")
-
-    def __init__(self, bot, ctx, command, when):
-        self._bot = bot
-        self.ctx = ctx
-        self.command = command
-        self.when = when
-        self._task = bot.loop.create_task(self.schedule_command())
-
-    async def schedule_command(self):
-        if self.when < datetime.datetime.utcnow():
-            pass
-        while self.when > datetime.datetime.utcnow():
-            difference = self.when - datetime.datetime.utcnow()
-            await asyncio.sleep(difference.total_seconds() - 30)
-        self._bot.dispatch("scheduled_command", self)
+        Reminders due within ``SHORT_FOR`` seconds, or whose save failed, are never written to the backend and
+        only live in the local timer journal under a negative id.
+        """
+        if create and (self.delta - datetime.datetime.utcnow()).total_seconds() > self.SHORT_FOR:
+            await self.save()
+        if self.id is None:
+            await self.dto.journal.wait_replayed()
+            self.id = self.dto.journal.next_id()
+            self.short = True
+        self.dto.schedule_reminder(self)
 
     def cancel(self):
-        if self._task:
-            return self._task.cancel()
+        self.journal.forget("reminder", self.id)
+        return self.timers.cancel(("reminder", self.id))
 
 
 class Command(API):
     __slots__ = ("name", "documentation", "cog", "aliases", "blocked_channels", "blocked_guilds", "blocked_users")
 
-    POST_URL = "commands/{id}"
+    POST_URL = "commands/{name}"
+    METADATA_FIELDS = ("name", "documentation", "aliases", "cog")
     PRIMARY_KEY = "name"
+    FIELDS = (
+        Field("id"),
+        Field("name"),
+        Field("documentation"),
+        Field("cog"),
+        Field("aliases", default=""),
+        Field("blocked_channels", factory=list, parser=parse_command_channels),
+        Field("blocked_guilds", factory=list, parser=parse_command_channels),
+        Field("blocked_users", factory=list, parser=parse_command_channels),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop("id", None)
-        self.name = kwargs.pop("name", None)
-        self.documentation = kwargs.pop("documentation", None)
-        self.cog = kwargs.pop("cog", None)
-        self.aliases = kwargs.pop("aliases", "")
-        self.blocked_channels = parse_command_channels(kwargs.pop("blocked_channels", []))
-        self.blocked_guilds = parse_command_channels(kwargs.pop("blocked_guilds", []))
-        self.blocked_users = parse_command_channels(kwargs.pop("blocked_users", []))
-        self._dto = dto
+        self._load(kwargs, dto)
+
+    @property
+    def content_hash(self) -> str:
+        """Digest of the metadata the bot owns, the backend copy only needs writing when this differs"""
+        metadata = "\x1f".join(str(getattr(self, field, None) or "") for field in self.METADATA_FIELDS)
+        return hashlib.sha1(metadata.encode()).hexdigest()
 
 
 class Task(API):
     __slots__ = ("id", "author", "created", "finished", "content", "number")
 
     POST_URL = "users/{author}/tasks/{id}"
+    FIELDS = (
+        Field("id"),
+        Field("author", source="discord_id"),
+        Field("created", parser=parse_date),
+        Field("finished", parser=parse_date),
+        Field("content"),
+        Field("number"),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)
-        self.author = kwargs.pop('discord_id', None)
-        self.created = parse_date(kwargs.pop('created', None))
-        self.finished = parse_date(kwargs.pop('finished', None))
-        self.content = kwargs.pop('content', None)
-        self.number = kwargs.pop('number', None)
-        self._dto = dto
+        self._load(kwargs, dto)
 
 
 class User(API):
     __slots__ = ("id", "league", "pubg", "osu", "location", "blocked")
 
     POST_URL = "users/{id}"
+    CACHE_TTL = 300
+    FIELDS = (
+        Field("id"),
+        Field("league"),
+        Field("pubg"),
+        Field("osu"),
+        Field("location"),
+        Field("blocked", default=False),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)  # type: int
-        self.league = kwargs.pop('league', None)  # type: str
-        self.pubg = kwargs.pop("pubg", None)  # type: str
-        self.osu = kwargs.pop("osu", None)  # type: str
-        self.location = kwargs.pop('location', None)  # type: str
-        self.blocked = kwargs.pop("blocked", False)
-        self._dto = dto
+        self._load(kwargs, dto)
 
     def __str__(self):
         return str(self.id)
 
     async def add_reminder(self, create=True, **kwargs) -> typing.Optional[Reminder]:
         reminder = Reminder(self._dto, user=self.id, **kwargs)
-        delta = (reminder.delta - datetime.datetime.utcnow()).total_seconds()
-        if create and delta > 300:
-            await reminder.save()
-            self._dto._reminders[self.id] = {reminder.id: reminder}
-        else:
-            self.bot.loop.create_task(reminder.start())
+        await reminder.start(create)
         return reminder
 
     async def short_timer_optimisation(self, seconds, timer):
@@ -403,22 +1147,43 @@ class User(API):
 
 class Tag(API):
     __slots__ = (
-        "id", "author", "title", "content", "created", "edited", "orphaned", "previous_author", "guild", "count")
+        "id", "author", "title", "_content", "created", "edited", "orphaned", "previous_author", "guild", "count")
 
     POST_URL = "guilds/{guild}/tags/{id}"
+    CONTENT_STORE = TAG_CONTENT
+    FIELDS = (
+        Field("id"),
+        Field("author", source=("discord_id", "author")),
+        Field("title"),
+        Field("_content", parser=TAG_CONTENT.put),
+        Field("created", parser=parse_date),
+        Field("edited", parser=parse_date),
+        Field("orphaned"),
+        Field("previous_author"),
+        Field("guild"),
+        Field("count", default=0),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)
-        self.author = kwargs.pop('discord_id', kwargs.pop("author", None))
-        self.title = kwargs.pop('title', None)
-        self.content = kwargs.pop('content', None)
-        self.created = parse_date(kwargs.pop("created", None))
-        self.edited = parse_date(kwargs.pop("edited", None))
-        self.orphaned = kwargs.pop("orphaned", None)
-        self.previous_author = kwargs.pop("previous_author", None)
-        self.guild = kwargs.pop('guild', None)
-        self.count = kwargs.pop('count', 0)
-        self._dto = dto
+        self._load(kwargs, dto)
+
+    @property
+    def content(self) -> typing.Optional[str]:
+        return self.CONTENT_STORE.read(self._content)
+
+    @content.setter
+    def content(self, value: str):
+        self._content = self.CONTENT_STORE.put(value)
+
+    @property
+    def body(self) -> typing.Optional[Body]:
+        return self._content
+
+    @classmethod
+    def compact(cls, payload: dict) -> tuple:
+        # Contents go to the shared store right away, so never materialised guilds hold them deduplicated too
+        return tuple(cls.CONTENT_STORE.put(value) if field.name == "_content" and value is not _MISSING else value
+                     for field, value in zip(cls.FIELDS, super().compact(payload)))
 
     def __str__(self):
         return self.content
@@ -432,30 +1197,34 @@ class Channel(API):
 
     POST_URL = "guilds/{guild}/channels/{id}"
     PRIMARY_KEY = "channel"
+    FIELDS = (
+        Field("channel"),
+        Field("guild"),
+        Field("created", parser=parse_date),
+        Field("blocker", source=("discord_id", "blocker")),
+        Field("reason"),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.channel = kwargs.pop("channel", None)
-        self.guild = kwargs.pop("guild", None)
-        self.created = parse_date(kwargs.pop("created", None))
-        self.blocker = kwargs.pop('discord_id', kwargs.pop("blocker", None))
-        self.reason = kwargs.pop("reason", None)
-        self._dto = dto
+        self._load(kwargs, dto)
 
 
 class Alias(API):
     __slots__ = ("id", "original", "author", "created", "title", "guild", "count")
 
     POST_URL = "guilds/{guild}/aliases/{id}"
+    FIELDS = (
+        Field("id"),
+        Field("original"),
+        Field("author", source=("discord_id", "author")),
+        Field("created", parser=parse_date),
+        Field("title"),
+        Field("guild"),
+        Field("count", default=0),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)
-        self.original = kwargs.pop("original", None)
-        self.author = kwargs.pop('discord_id', kwargs.pop("author", None))
-        self.created = parse_date(kwargs.pop("created", None))
-        self.title = kwargs.pop("title", None)
-        self.guild = kwargs.pop('guild', None)
-        self.count = kwargs.pop('count', 0)
-        self._dto = dto
+        self._load(kwargs, dto)
 
     def __str__(self):
         return self.title
@@ -465,14 +1234,16 @@ class NickName(API):
     __slots__ = ("id", "member", "nickname", "changed", "guild")
 
     POST_URL = "guilds/{guild}/members/{member}/nicknames/{id}"
+    FIELDS = (
+        Field("id"),
+        Field("member", source=("discord_id", "member")),
+        Field("nickname"),
+        Field("changed", parser=parse_date),
+        Field("guild"),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop("id", None)
-        self.member = kwargs.pop('discord_id', kwargs.pop("member", None))
-        self.nickname = kwargs.pop("nickname", None)
-        self.changed = parse_date(kwargs.pop("changed", None))
-        self.guild = kwargs.pop("guild", None)
-        self._dto = dto
+        self._load(kwargs, dto)
 
     def __str__(self):
         return self.nickname
@@ -485,20 +1256,23 @@ class Member(API):
                  "reputation", "experience", "_discord_id", "_userobj")
 
     POST_URL = "guilds/{guild}/members/{discord_id}"
+    CACHE_TTL = 120
+    FIELDS = (
+        Field("id"),
+        Field("guild"),
+        Field("administrator"),
+        Field("last_spoke", parser=parse_date),
+        Field("level"),
+        Field("achievement_points"),
+        Field("achievements", factory=list),
+        Field("wallet", default=0),
+        Field("reputation"),
+        Field("experience"),
+        Field("_discord_id"),
+    )
 
     def __init__(self, dto: DiscordDto, userobj=None, **kwargs):
-        self.id = kwargs.pop("id", None)
-        self.guild = kwargs.pop('guild', None)
-        self.administrator = kwargs.pop('administrator', None)
-        self.last_spoke = parse_date(kwargs.pop('last_spoke', None))
-        self.level = kwargs.pop('level', None)
-        self.achievement_points = kwargs.pop('achievement_points', None)
-        self.achievements = kwargs.pop("achievements", [])
-        self.wallet = kwargs.pop('wallet', 0)
-        self.reputation = kwargs.pop('reputation', None)
-        self.experience = kwargs.pop("experience", None)
-        self._discord_id = kwargs.pop("discord_id", None)
-        self._dto = dto
+        self._load(kwargs, dto)
         if isinstance(kwargs.get("user"), dict):
             self._userobj: User = userobj or User(dto, **kwargs.pop("user", {}))
         else:
@@ -561,15 +1335,17 @@ class Prefix(API):
     __slots__ = ("id", "guild", "prefix", "author", "uses", "created")
 
     POST_URL = "guilds/{guild}/prefixes/{id}"
+    FIELDS = (
+        Field("id"),
+        Field("guild"),
+        Field("prefix"),
+        Field("author", source=("discord_id", "author")),
+        Field("uses", default=0),
+        Field("created", parser=parse_date),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)
-        self.guild = kwargs.pop('guild', None)
-        self.prefix = kwargs.pop('prefix', None)
-        self.author = kwargs.pop('discord_id', kwargs.pop("author", None))
-        self.uses = kwargs.pop("uses", 0)
-        self.created = parse_date(kwargs.pop('created', None))
-        self._dto = dto
+        self._load(kwargs, dto)
 
     def __str__(self):
         return self.prefix
@@ -584,28 +1360,32 @@ class Prefix(API):
 class Call(API):
     __slots__ = ("id", "tag", "alias", "author", "channel", "guild", "called")
     POST_URL = "calls/{id}"
+    FIELDS = (
+        Field("id"),
+        Field("tag"),
+        Field("alias"),
+        Field("author", source=("discord_id", "author")),
+        Field("channel"),
+        Field("guild"),
+        Field("called", parser=parse_date),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)
-        self.tag = kwargs.pop('tag', None)
-        self.alias = kwargs.pop('alias', None)
-        self.author = kwargs.pop('discord_id', kwargs.pop("author", None))
-        self.channel = kwargs.pop('channel', None)
-        self.guild = kwargs.pop('guild', None)
-        self.called = parse_date(kwargs.pop('called', None))
-        self._dto = dto
+        self._load(kwargs, dto)
 
 
 class Activity(API):
     __slots__ = ("id", "guild", "status", "role")
     POST_URL = "guilds/{guild}/activities/{id}"
+    FIELDS = (
+        Field("id"),
+        Field("guild"),
+        Field("status"),
+        Field("role"),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop('id', None)
-        self.guild = kwargs.pop('guild', None)
-        self.status = kwargs.pop('status', None)
-        self.role = kwargs.pop('role', None)
-        self._dto = dto
+        self._load(kwargs, dto)
 
     def get_role(self):
         return discord.utils.get(self.bot.get_guild(self.guild).roles, id=self.role)
@@ -615,16 +1395,18 @@ class FAQ(API):
     __slots__ = ("id", "guild", "author", "uses", "question", "answer", "created_at")
 
     POST_URL = "guilds/{guild}/faq/{id}"
+    FIELDS = (
+        Field("id"),
+        Field("guild"),
+        Field("author", source=("discord_id", "author")),
+        Field("uses", default=0),
+        Field("question", default=""),
+        Field("answer", default=""),
+        Field("created_at", factory=datetime.datetime.utcnow, parser=parse_date),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.id = kwargs.pop("id", None)
-        self.guild = kwargs.pop("guild", None)
-        self.author = kwargs.pop('discord_id', kwargs.pop("author", None))
-        self.uses = kwargs.pop("uses", 0)
-        self.question = kwargs.pop("question", "")
-        self.answer = kwargs.pop("answer", "")
-        self.created_at = parse_date(kwargs.pop("created_at", datetime.datetime.utcnow().replace(tzinfo=None)))
-        self._dto = dto
+        self._load(kwargs, dto)
 
     def __str__(self):
         return self.question
@@ -635,8 +1417,7 @@ class FAQ(API):
         faq_author = ctx.guild.get_member(self.author)
         if faq_author:
             embed.set_author(name=faq_author.display_name, icon_url=faq_author.avatar_url)
-        self.uses += 1
-        await self.update()
+        self.increment("uses")
         return await ctx.send(embed=embed)
 
     @property
@@ -647,34 +1428,154 @@ class FAQ(API):
 class Guild(API):
     __slots__ = (
         "guild", "premium", "tracking", "welcome_channel", "leaving_channel", "welcome_message", "leaving_message",
-        "role", "delay", "_dto")
+        "role", "delay", "available", "_dto")
     POST_URL = "guilds/{guild}"
     PRIMARY_KEY = "guild"
+    IDLE_EVICTION = 900
+    FIELDS = (
+        Field("guild"),
+        Field("premium"),
+        Field("tracking"),
+        Field("welcome_channel"),
+        Field("leaving_channel"),
+        Field("welcome_message"),
+        Field("leaving_message"),
+        Field("available", default=True),
+        Field("role"),
+        Field("delay"),
+    )
 
     def __init__(self, dto: DiscordDto, **kwargs):
-        self.guild: int = kwargs.pop('guild', None)
-        self.premium: bool = kwargs.pop('premium', None)
-        self.tracking: bool = kwargs.pop('tracking', None)
-        self.welcome_channel: int = kwargs.pop("welcome_channel", None)
-        self.leaving_channel: int = kwargs.pop("leaving_channel", None)
-        self.welcome_message: str = kwargs.pop('welcome_message', None)
-        self.leaving_message: str = kwargs.pop("leaving_message", None)
-        self.available: bool = kwargs.pop("available", True)
-        self.role: int = kwargs.pop('role', None)
-        self.delay: int = kwargs.pop('delay', None)
-        self._dto: DiscordDto = dto
-        self._prefixes: typing.Dict[str, Prefix] = {data['prefix']: Prefix(self._dto, guild=self.guild, **data) for data
-                                                    in
-                                                    kwargs.pop("prefixes", {})}
-        self._tags: typing.Dict[str, Tag] = {data['title']: Tag(self._dto, **data) for data in kwargs.pop("tags", {})}
-        self._aliases: typing.Dict[str, Alias] = {data['title']: Alias(self._dto, **data) for data in
-                                                  kwargs.pop("aliases", {})}
-        self._activities: typing.Dict[str, Activity] = {data['status']: Activity(self._dto, **data)
-                                                        for data in kwargs.pop("activities", {})}
-        self._blocked_channels: typing.Dict[int, Channel] = {data['channel']: Channel(self._dto, **data) for data in
-                                                             kwargs.pop("channels", {})}
-        self._faqs: typing.Dict[str, FAQ] = {data['question']: FAQ(self._dto, **data) for data in
-                                             kwargs.pop("faqs", {})}
+        self._load(kwargs, dto)
+        self._prefixes: typing.Dict[str, Prefix] = LazyCollection(Prefix, "prefix", dto, self.guild,
+                                                                  kwargs.pop("prefixes", ()))
+        self._tags: typing.Dict[str, Tag] = LazyCollection(Tag, "title", dto, self.guild, kwargs.pop("tags", ()))
+        self._aliases: typing.Dict[str, Alias] = LazyCollection(Alias, "title", dto, self.guild,
+                                                                kwargs.pop("aliases", ()))
+        self._activities: typing.Dict[str, Activity] = LazyCollection(Activity, "status", dto, self.guild,
+                                                                      kwargs.pop("activities", ()))
+        self._blocked_channels: typing.Dict[int, Channel] = LazyCollection(Channel, "channel", dto, self.guild,
+                                                                           kwargs.pop("channels", ()))
+        self._faqs: typing.Dict[str, FAQ] = LazyCollection(FAQ, "question", dto, self.guild, kwargs.pop("faqs", ()))
+        self._tag_index: typing.Optional[TagIndex] = None
+        self._tag_stats: typing.Optional[TagStats] = None
+        self._prefix_matcher: typing.Optional[PrefixMatcher] = None
+        self._activity_map: typing.Optional[ActivityRoles] = None
+        self._stats_task: typing.Optional[asyncio.Task] = None
+
+    # Change feed model name -> (collection attribute, model, payload key the collection is keyed on)
+    CHANGE_MODELS = {
+        "prefix": ("_prefixes", Prefix, "prefix"),
+        "tag": ("_tags", Tag, "title"),
+        "alias": ("_aliases", Alias, "title"),
+        "activity": ("_activities", Activity, "status"),
+        "channel": ("_blocked_channels", Channel, "channel"),
+        "faq": ("_faqs", FAQ, "question"),
+    }
+
+    def apply_change(self, model: str, action: str, data: dict) -> bool:
+        """Applies one change feed record to the in memory guild, returns whether anything changed
+
+        Upserts update the existing object in place, matched on id so renames move it to its new key
+        """
+        if model == "guild":
+            if action == "delete":
+                return False
+            self.refresh(data)
+            return True
+        spec = self.CHANGE_MODELS.get(model)
+        if spec is None:
+            return False
+        attribute, model_cls, key_field = spec
+        if attribute == "_prefixes":
+            self._prefix_matcher = None
+        elif attribute == "_activities":
+            self._activity_map = None
+        if attribute in ("_tags", "_aliases") and self._tag_stats is not None:
+            self._tag_stats.reconciled_at = 0.0
+        collection = getattr(self, attribute)
+        key = data.get(key_field)
+        current_key = key if key in collection else None
+        record_id = data.get("id")
+        if record_id is not None and (current_key is None or getattr(collection[current_key], "id", None) != record_id):
+            current_key = next((k for k, obj in collection.items() if getattr(obj, "id", None) == record_id), None)
+        if action == "delete":
+            if current_key is None:
+                return False
+            self._drop_tag_index(attribute)
+            return collection.pop(current_key, None) is not None
+        if key is None:
+            return False
+        if current_key is None:
+            self._drop_tag_index(attribute)
+            collection[key] = model_cls(self._dto, **dict(data, guild=self.guild))
+            return True
+        obj = collection.pop(current_key)
+        author = getattr(obj, "author", None)
+        obj.refresh(data)
+        collection[key] = obj
+        if key != current_key:
+            self._drop_tag_index(attribute)
+        elif attribute == "_tags" and obj.author != author and self._tag_index is not None:
+            self._tag_index.change_author(obj, author)
+        return True
+
+    def _drop_tag_index(self, attribute: str):
+        # Added, deleted and renamed records are rare enough to simply rebuild the index on next use
+        if attribute in ("_tags", "_aliases"):
+            self._tag_index = None
+
+    @staticmethod
+    def _edited(collection) -> bool:
+        if isinstance(collection, LazyCollection):
+            return collection.edited
+        return any(item.dirty_fields for item in collection.values())
+
+    def has_local_edits(self) -> bool:
+        """Whether the guild or a record in one of its collections was edited locally and not yet written back
+
+        Counters queued on the write behind stay dirty until written, so they count too.
+        """
+        return bool(self.dirty_fields) or any(self._edited(getattr(self, attribute))
+                                              for attribute, _, _ in self.CHANGE_MODELS.values())
+
+    def merge(self, fresh: "Guild"):
+        """Takes what ``fresh`` loaded from the backend, keeping the fields and collections with local edits
+
+        A collection holding an unwritten edit is kept whole rather than mixed record by record with ``fresh``.
+        """
+        self.refresh({field.sources[0]: getattr(fresh, field.name, None) for field in self.FIELDS})
+        for attribute, _, _ in self.CHANGE_MODELS.values():
+            if not self._edited(getattr(self, attribute)):
+                object.__setattr__(self, attribute, getattr(fresh, attribute))
+        self._prefix_matcher = None
+        self._activity_map = None
+        self._tag_index = None
+        if self._tag_stats is not None:
+            self._tag_stats.reconciled_at = 0.0
+
+    def to_payload(self) -> dict:
+        payload = super().to_payload()
+        for key, collection in (("prefixes", self._prefixes), ("tags", self._tags), ("aliases", self._aliases),
+                                ("activities", self._activities), ("channels", self._blocked_channels),
+                                ("faqs", self._faqs)):
+            payload[key] = collection.payloads() if isinstance(collection, LazyCollection) else \
+                [item.to_payload() for item in collection.values()]
+        return payload
+
+    def memory_usage(self) -> typing.Dict[str, int]:
+        """Tag content held for this guild, bodies shared with other guilds count in full for each of them"""
+        usage = ContentStore.usage(self._tags.field_values("_content") if isinstance(self._tags, LazyCollection)
+                                   else [tag.body for tag in self._tags.values()])
+        usage["tags"] = len(self._tags)
+        return usage
+
+    def evict_idle(self, idle: float = None) -> int:
+        """Returns sub-collections unused for ``idle`` seconds to their compact form, counting how many were"""
+        idle = self.IDLE_EVICTION if idle is None else idle
+        return sum(1 for collection in (self._prefixes, self._tags, self._aliases, self._activities,
+                                        self._blocked_channels, self._faqs)
+                   if isinstance(collection, LazyCollection) and collection.evict(idle))
 
     @property
     def blocked_channels(self):
@@ -691,6 +1592,19 @@ class Guild(API):
     @activities.setter
     def activities(self, value):
         self._activities = value
+        self._activity_map = None
+
+    @property
+    def activity_map(self) -> ActivityRoles:
+        """Built on first use without materializing the activities, dropped whenever they change"""
+        if self._activity_map is None:
+            if isinstance(self._activities, LazyCollection):
+                statuses, roles = self._activities.field_values("status"), self._activities.field_values("role")
+            else:
+                statuses = [activity.status for activity in self._activities.values()]
+                roles = [activity.role for activity in self._activities.values()]
+            self._activity_map = ActivityRoles(statuses, roles)
+        return self._activity_map
 
     @property
     def tags(self):
@@ -699,6 +1613,7 @@ class Guild(API):
     @tags.setter
     def tags(self, value):
         self._tags = value
+        self._tag_index = None
 
     @property
     def aliases(self):
@@ -707,6 +1622,14 @@ class Guild(API):
     @aliases.setter
     def aliases(self, value):
         self._aliases = value
+        self._tag_index = None
+
+    @property
+    def tag_index(self) -> TagIndex:
+        """Built on first use, then kept in step by the tag and alias methods below"""
+        if self._tag_index is None:
+            self._tag_index = TagIndex(self._tags.values(), self._aliases.values())
+        return self._tag_index
 
     @property
     def prefixes(self) -> typing.Dict[str, Prefix]:
@@ -715,6 +1638,15 @@ class Guild(API):
     @prefixes.setter
     def prefixes(self, value):
         self._prefixes = value
+        self._prefix_matcher = None
+
+    def prefix_matcher(self, mentions: typing.Sequence[str]) -> PrefixMatcher:
+        """Built on first use without materializing the prefixes, dropped whenever they change"""
+        if self._prefix_matcher is None:
+            prefixes = self._prefixes.field_values("prefix") if isinstance(self._prefixes, LazyCollection) \
+                else self._prefixes.keys()
+            self._prefix_matcher = PrefixMatcher(prefixes, mentions)
+        return self._prefix_matcher
 
     @property
     def faqs(self):
@@ -729,7 +1661,7 @@ class Guild(API):
         return [activity.get_role() for activity in self._activities.values()]
 
     async def get_member(self, pid: int) -> Member:
-        member: Member = await self.get(Member, guild=self.guild, user=pid, create=True)
+        member: Member = await self.get(Member, guild=self.guild, discord_id=pid, user=pid, create=True)
         if member:
             user = await self.get(User, id=pid)
             member._userobj = user
@@ -744,14 +1676,45 @@ class Guild(API):
         await member.save()
         return member
 
+    async def _reconcile_tag_stats(self, stats: TagStats, background: bool = False):
+        try:
+            tagboard = await self.fetch_data(f"guilds/{self.guild}/tagboard")
+        except BackendUnavailable as e:
+            if not background:
+                raise
+            self.logger.warning(f"Tag stats reconcile skipped for guild {self.guild} : {e}")
+            return
+        stats.reconcile(self._tags.values(), self.tag_index.creator_counts(),
+                        tagboard if isinstance(tagboard, dict) else {})
+
+    async def get_tag_stats(self) -> TagStats:
+        """The guild's tag leaderboards, only the first call waits on the backend
+
+        After that stale boards are served as they are while they are reconciled in the background
+        """
+        if self._tag_stats is None:
+            stats = TagStats()
+            await self._reconcile_tag_stats(stats)
+            self._tag_stats = stats
+        elif self._tag_stats.stale and (self._stats_task is None or self._stats_task.done()):
+            self._stats_task = self.bot.loop.create_task(self._reconcile_tag_stats(self._tag_stats, background=True))
+        return self._tag_stats
+
     def find_tag_by_id(self, id) -> typing.Optional[Tag]:
-        for tag in self.tags.values():
-            if tag.id == id:
-                return tag
+        title = self.tag_index.title_of(id)
+        if title is not None:
+            return self._tags.get(title)
+
+    def get_tags_by_author(self, author: int) -> typing.List[Tag]:
+        return [self._tags[title] for title in self.tag_index.titles_by(author)]
 
     def get_tag(self, tag: str, pop=False) -> typing.Tuple[Tag, typing.Union[Alias, None]]:
         if pop:
-            response = self._tags.pop(tag, self._aliases.pop(tag, None))
+            response = self._tags.pop(tag, None) or self._aliases.pop(tag, None)
+            if isinstance(response, Alias):
+                self.tag_index.remove_alias(response)
+            elif response is not None:
+                self.tag_index.remove_tag(response)
         else:
             response = self._tags.get(tag, self._aliases.get(tag))
         if isinstance(response, Alias):
@@ -761,17 +1724,25 @@ class Guild(API):
         else:
             raise TagNotFound(tag)
 
-    async def get_member_tags(self, author: int) -> typing.List[Tag]:
-        member = await self.get_member(author)
-        return [tag.title for tag in self.tags.values() if tag.author == member.id]
-
-    def get_all_aliases(self, tag: str) -> typing.List[Alias]:
-        payload = []
-        for alias in self.aliases:
-            if alias == tag:
-                payload.append(alias)
-        payload = [self.aliases.pop(alias, None) for alias in payload]
-        return payload
+    def change_tag_author(self, tag: Tag, author: int):
+        """Hands ``tag`` over to ``author``, the change still has to be saved"""
+        previous = tag.author
+        tag.author = author
+        self.tag_index.change_author(tag, previous)
+        if self._tag_stats is not None:
+            self._tag_stats.reconciled_at = 0.0
+
+    async def get_member_tags(self, author: int) -> typing.List[str]:
+        return list(self.tag_index.titles_by(author))
+
+    def get_all_aliases(self, tag: Tag) -> typing.List[Alias]:
+        """Removes and returns every alias pointing at ``tag``"""
+        titles = list(self.tag_index.alias_titles_of(tag.id))
+        payload = [self._aliases.pop(title, None) for title in titles]
+        for alias in payload:
+            if alias is not None:
+                self.tag_index.remove_alias(alias)
+        return [alias for alias in payload if alias is not None]
 
     async def create_tag(self, content: str, title: str, author: int) -> typing.Optional[Tag]:
         try:
@@ -782,6 +1753,9 @@ class Guild(API):
                                      guild=self.guild)
             if new_tag:
                 self.tags[title] = new_tag
+                self.tag_index.add_tag(new_tag)
+                if self._tag_stats is not None:
+                    self._tag_stats.tag_created(new_tag)
             return new_tag
 
     async def create_alias(self, original, new_alias, author):
@@ -792,6 +1766,7 @@ class Guild(API):
             response = await nalias.save()
             if response:
                 self.aliases[new_alias] = nalias
+                self.tag_index.add_alias(nalias)
             return nalias
         else:
             raise TagAlreadyExists(new_alias)
@@ -812,8 +1787,10 @@ class Guild(API):
             return tag
 
     async def delete_tag(self, tag: Tag) -> bool:
+        aliases = self.get_all_aliases(tag)
         tag = self.get_tag(tag.title, True)
-        aliases = self.get_all_aliases(tag[0].title)
+        if self._tag_stats is not None:
+            self._tag_stats.tag_deleted(tag[0])
         for alias in aliases:
             await alias.delete()
         response = await tag[0].delete()
@@ -824,6 +1801,8 @@ class Guild(API):
             data = self._aliases.get(alias)
         else:
             data = self._aliases.pop(alias, None)
+            if data is not None:
+                self.tag_index.remove_alias(data)
         if data is None:
             raise TagNotFound(alias)
         else:
@@ -833,25 +1812,27 @@ class Guild(API):
         new_prefix = await self.get(Prefix, {"prefix": prefix, "author": author}, guild=self.guild, create=True)
         if new_prefix:
             self._prefixes[prefix] = new_prefix
+            self._prefix_matcher = None
             return new_prefix
 
     async def delete_prefix(self, prefix) -> typing.Optional[Prefix]:
         selected = self._prefixes.pop(prefix, None)
         if selected is not None:
+            self._prefix_matcher = None
             await selected.delete()
             return selected
 
     async def call_tag(self, ctx, request):
         tag, alias = self.get_tag(request)
         if alias:
-            alias.count += 1
-            await alias.update()
+            alias.increment("count")
         else:
-            tag.count += 1
-            await tag.update()
+            tag.increment("count")
+        if self._tag_stats is not None and tag is not None:
+            self._tag_stats.record_call(ctx.author.id, tag, alias)
         data = Call(self._dto, guild=ctx.guild.id, channel=ctx.channel.id, author=ctx.author.id,
                     tag=tag.id if hasattr(tag, "id") else None, alias=alias.id if hasattr(alias, "id") else None)
-        await data.save()
+        self.telemetry.record("calls", data.data)
         return tag, alias
 
     async def add_activity(self, name, role):
@@ -859,21 +1840,28 @@ class Guild(API):
         if not new_activity:
             new_activity = Activity(self._dto, guild=self.guild, status=name.lower(), role=role)
             await new_activity.save()
+        self._activities[new_activity.status] = new_activity
+        self._activity_map = None
         return new_activity
 
     async def edit_activity(self, name, role, new_name=None):
         activity = await self.get(Activity, {"status": name}, guild=self.guild)
         if activity:
-            activity.role = role
+            activity.role = getattr(role, "id", role)
             if new_name:
-                activity.status = new_name
-        await activity.save()
+                activity.status = new_name.lower()
+            await activity.save()
+            self._activities.pop(name, None)
+            self._activities[activity.status] = activity
+            self._activity_map = None
+        return activity
 
     async def delete_activity(self, name):
         selected = self.activities.get(name, None)
         if selected:
             response = await selected.delete()
             if response:
+                self._activity_map = None
                 return self.activities.pop(name)
 
     async def block_channel(self, channel, author, reason=None):
@@ -0,0 +1,33 @@
+import typing
+
+
+class PrefixMatcher:
+    """A guild's command prefixes and the bot's mention forms in a character trie
+
+    ``match`` walks the message content once and returns only the longest prefix it starts with, so the command
+    parser has a single ``startswith`` left to do however many prefixes the guild has. Content starting with none
+    of them costs one dict lookup on its first character.
+    """
+    __slots__ = ("_root", "fallback")
+
+    def __init__(self, prefixes: typing.Iterable[str], mentions: typing.Sequence[str] = ()):
+        self._root: dict = {}
+        self.fallback: typing.List[str] = list(mentions)
+        for prefix in set(mentions).union(prefixes):
+            if not prefix:
+                continue
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[None] = prefix
+
+    def match(self, content: str) -> typing.List[str]:
+        """``[longest matching prefix]``, or the mention forms when nothing matches since discord.py wants one"""
+        node = self._root
+        found = None
+        for char in content:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return [found] if found is not None else self.fallback
@@ -0,0 +1,77 @@
+import collections
+import datetime
+import typing
+
+
+class MessageBuffer:
+    """Command looking messages that arrived before their guild's data loaded, kept to be replayed in order
+
+    Each guild (``None`` for DMs) gets a queue of at most ``MAX_PER_GUILD`` messages, the oldest is dropped when it
+    overflows. Guild prefixes are unknown until the data loads, so a message is only taken when it starts like a
+    command: with punctuation or a mention rather than a letter, digit or space. A queue keeps taking every message
+    of its guild while it drains so nothing overtakes the replayed ones. Messages older than ``max_age`` seconds by
+    the time they come up are dropped instead of replayed.
+    """
+    MAX_PER_GUILD = 20
+    MAX_AGE = 60
+
+    __slots__ = ("_queues", "_draining", "max_age", "buffered", "replayed", "expired", "overflowed")
+
+    def __init__(self, max_age: float = None):
+        self._queues: typing.Dict[typing.Optional[int], typing.Deque] = {}
+        self._draining: typing.Set[typing.Optional[int]] = set()
+        self.max_age = self.MAX_AGE if max_age is None else max_age
+        self.buffered = 0
+        self.replayed = 0
+        self.expired = 0
+        self.overflowed = 0
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def __contains__(self, key):
+        return key in self._queues
+
+    @staticmethod
+    def looks_like_command(content: str) -> bool:
+        return bool(content) and not (content[0].isalnum() or content[0].isspace())
+
+    def add(self, key: typing.Optional[int], message, check: bool = True) -> bool:
+        """Queues ``message`` for ``key``, with ``check`` only if it starts like a command"""
+        if check and not self.looks_like_command(message.content):
+            return False
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = collections.deque(maxlen=self.MAX_PER_GUILD)
+        elif len(queue) == queue.maxlen:
+            self.overflowed += 1
+        queue.append(message)
+        self.buffered += 1
+        return True
+
+    def should_drain(self, key: typing.Optional[int]) -> bool:
+        return key in self._queues and key not in self._draining
+
+    def drain(self, key: typing.Optional[int]) -> typing.Iterator:
+        """Yields ``key``'s messages oldest first, including any queued meanwhile, then forgets the queue"""
+        queue = self._queues.get(key)
+        if queue is None or key in self._draining:
+            return
+        self._draining.add(key)
+        try:
+            while queue:
+                message = queue.popleft()
+                if (datetime.datetime.utcnow() - message.created_at).total_seconds() > self.max_age:
+                    self.expired += 1
+                    continue
+                self.replayed += 1
+                yield message
+        finally:
+            self._draining.discard(key)
+            if not queue:
+                self._queues.pop(key, None)
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        return {"queued": len(self), "guilds": len(self._queues), "buffered": self.buffered,
+                "replayed": self.replayed, "expired": self.expired, "overflowed": self.overflowed}
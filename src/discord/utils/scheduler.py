@@ -0,0 +1,128 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+import logging
+import typing
+
+
+class TimerScheduler:
+    """Runs callbacks at given UTC datetimes from a single sleeping task
+
+    Timers sit in a min-heap ordered on when they are due. One task sleeps until the earliest of them and is woken
+    early when a sooner timer is added. Cancelled timers are only marked and skipped when they reach the top, the
+    heap is rebuilt once they outnumber the live ones. Scheduling an existing key at the same time is a no-op, so
+    the same timers can be loaded repeatedly.
+    """
+    MAX_SLEEP = 300
+
+    __slots__ = ("_heap", "_entries", "_counter", "_cancelled", "_clock", "_loop", "_task", "_wakeup", "fired",
+                 "logger")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None,
+                 clock: typing.Callable[[], datetime.datetime] = datetime.datetime.utcnow):
+        self._heap: typing.List[list] = []
+        self._entries: typing.Dict[typing.Hashable, list] = {}
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._clock = clock
+        self._loop = loop
+        self._task: typing.Optional[asyncio.Task] = None
+        self._wakeup: typing.Optional[asyncio.Event] = None
+        self.fired = 0
+        self.logger = logging.getLogger("errors")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def when(self, key) -> typing.Optional[datetime.datetime]:
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    @property
+    def next_due(self) -> typing.Optional[datetime.datetime]:
+        self._discard_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def schedule(self, key: typing.Hashable, when: datetime.datetime, callback: typing.Callable[[], typing.Any]):
+        """Runs ``callback`` at ``when``, replacing any timer already scheduled under ``key``"""
+        current = self._entries.get(key)
+        if current is not None:
+            if current[0] == when:
+                current[3] = callback
+                return
+            self._mark_cancelled(current)
+        entry = [when, next(self._counter), key, callback]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry and self._wakeup is not None:
+            self._wakeup.set()
+        self._ensure_running()
+
+    def cancel(self, key: typing.Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._mark_cancelled(entry, pop=False)
+        return True
+
+    def _mark_cancelled(self, entry: list, pop: bool = True):
+        if pop:
+            self._entries.pop(entry[2], None)
+        entry[3] = None
+        self._cancelled += 1
+        if self._cancelled > len(self._entries):
+            self._heap = [entry for entry in self._heap if entry[3] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _discard_cancelled(self):
+        while self._heap and self._heap[0][3] is None:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def pop_due(self, now: datetime.datetime = None) -> typing.List[typing.Callable[[], typing.Any]]:
+        """Removes and returns the callbacks of every timer due at ``now``, earliest first"""
+        now = now or self._clock()
+        due = []
+        while self._heap and (self._heap[0][3] is None or self._heap[0][0] <= now):
+            entry = heapq.heappop(self._heap)
+            if entry[3] is None:
+                self._cancelled -= 1
+                continue
+            del self._entries[entry[2]]
+            due.append(entry[3])
+        return due
+
+    def _ensure_running(self):
+        if self._loop is None:
+            return
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run())
+
+    async def _run(self):
+        # Made here, inside the task, so it belongs to the loop running it
+        self._wakeup = asyncio.Event()
+        while self._entries:
+            self._wakeup.clear()
+            for callback in self.pop_due():
+                self.fired += 1
+                try:
+                    callback()
+                except Exception:
+                    self.logger.exception("Timer callback failed")
+            next_due = self.next_due
+            if next_due is None:
+                break
+            delay = min(self.MAX_SLEEP, max(0.0, (next_due - self._clock()).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
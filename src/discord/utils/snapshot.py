@@ -0,0 +1,118 @@
+import asyncio
+import os
+import struct
+import typing
+import ujson
+import zlib
+
+
+class Snapshot:
+    """Keeps a local copy of the bot's guild and command data so a restart can serve commands before the backend
+    has been read back
+
+    The file is a fixed header (magic, format version, crc32 of the body) followed by zlib compressed json. A file
+    that is truncated, corrupt, from another format version or written against another backend is ignored.
+    """
+    MAGIC = b"ITSNAP"
+    VERSION = 1
+    HEADER = struct.Struct(">6sHI")
+    INTERVAL = 300
+    COMPRESS_LEVEL = 6
+    PATH = os.path.join("data", "snapshot.bin")
+
+    __slots__ = ("_bot", "_path", "_task", "written")
+
+    def __init__(self, bot, path: str = None):
+        self._bot = bot
+        self._path = path or self.PATH
+        self._task: typing.Optional[asyncio.Task] = None
+        self.written = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._bot.loop
+
+    @property
+    def logger(self):
+        return self._bot.error_logger
+
+    def _encode(self, document: dict) -> bytes:
+        body = zlib.compress(ujson.dumps(document).encode(), self.COMPRESS_LEVEL)
+        return self.HEADER.pack(self.MAGIC, self.VERSION, zlib.crc32(body)) + body
+
+    def _decode(self, raw: bytes) -> typing.Optional[dict]:
+        if len(raw) < self.HEADER.size:
+            return None
+        magic, version, checksum = self.HEADER.unpack_from(raw)
+        body = raw[self.HEADER.size:]
+        if magic != self.MAGIC or version != self.VERSION or zlib.crc32(body) != checksum:
+            return None
+        try:
+            return ujson.loads(zlib.decompress(body))
+        except (zlib.error, ValueError):
+            return None
+
+    def _write(self, document: dict):
+        temp_path = f"{self._path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self._encode(document))
+        os.replace(temp_path, self._path)
+
+    def _read(self) -> typing.Optional[dict]:
+        try:
+            with open(self._path, "rb") as file:
+                return self._decode(file.read())
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    async def _export(models: typing.Iterable) -> list:
+        """Exports one model at a time, yielding to the event loop in between so a large shard never stalls it"""
+        payloads = []
+        for model in list(models):
+            payloads.append(model.to_payload())
+            await asyncio.sleep(0)
+        return payloads
+
+    async def save(self):
+        """Captures the current guild and command data, the encoding and disk write happen off the event loop"""
+        bot = self._bot
+        document = {
+            "base_url": bot.base_url,
+            "guilds": await self._export(bot.guild_data.values()),
+            "commands": await self._export(bot.command_data.values()),
+        }
+        try:
+            await self.loop.run_in_executor(None, self._write, document)
+        except OSError:
+            self.logger.exception(f"Unable to write snapshot to {self._path}")
+            return
+        self.written += 1
+
+    async def load(self) -> typing.Optional[dict]:
+        document = await self.loop.run_in_executor(None, self._read)
+        if document is None:
+            if os.path.exists(self._path):
+                self.logger.warning(f"Ignoring unreadable snapshot {self._path}")
+            return None
+        if document.get("base_url") != self._bot.base_url:
+            return None
+        return document
+
+    async def _run(self):
+        while not self._bot.is_closed():
+            await asyncio.sleep(self.INTERVAL)
+            try:
+                await self.save()
+            except Exception:
+                self.logger.exception("Periodic snapshot failed")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = self.loop.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        if self._bot.data_base_built:
+            await self.save()
@@ -0,0 +1,148 @@
+import collections
+import heapq
+import itertools
+import typing
+from time import monotonic
+
+
+class TrigramIndex:
+    """Inverted index from character trigrams to titles, for ranked fuzzy title search
+
+    Titles are lower cased and padded so short titles and word starts still produce grams. Candidates are scored
+    by the Dice coefficient of their gram sets against the query's.
+    """
+    TIME_BUDGET = 0.05
+    THRESHOLD = 0.3
+
+    __slots__ = ("_postings", "_grams")
+
+    def __init__(self, titles: typing.Iterable[str] = ()):
+        self._postings: typing.Dict[str, typing.Set[str]] = collections.defaultdict(set)
+        self._grams: typing.Dict[str, typing.FrozenSet[str]] = {}
+        for title in titles:
+            self.add(title)
+
+    def __len__(self):
+        return len(self._grams)
+
+    def __contains__(self, title):
+        return title in self._grams
+
+    @staticmethod
+    def grams(text: str) -> typing.FrozenSet[str]:
+        padded = f"  {text.lower()} "
+        return frozenset(padded[index:index + 3] for index in range(len(padded) - 2))
+
+    def add(self, title: str):
+        if title in self._grams:
+            return
+        grams = self._grams[title] = self.grams(title)
+        for gram in grams:
+            self._postings[gram].add(title)
+
+    def remove(self, title: str):
+        grams = self._grams.pop(title, None)
+        if grams is None:
+            return
+        for gram in grams:
+            titles = self._postings.get(gram)
+            if titles is not None:
+                titles.discard(title)
+                if not titles:
+                    del self._postings[gram]
+
+    def search(self, query: str, limit: int = 5, threshold: float = None, budget: float = None) \
+            -> typing.List[typing.Tuple[float, str]]:
+        """Returns up to ``limit`` (score, title) pairs, best first, scoring at least ``threshold``
+
+        Posting lists are merged rarest first and merging stops once ``budget`` seconds are spent, so a query
+        made of very common grams returns the best candidates found in time rather than stalling
+        """
+        threshold = self.THRESHOLD if threshold is None else threshold
+        deadline = monotonic() + (self.TIME_BUDGET if budget is None else budget)
+        query_grams = self.grams(query)
+        postings = sorted((self._postings[gram] for gram in query_grams if gram in self._postings), key=len)
+        shared = collections.Counter()
+        for titles in postings:
+            shared.update(titles)
+            if monotonic() > deadline:
+                break
+        size = len(query_grams)
+        scored = ((2 * count / (size + len(self._grams[title])), title) for title, count in shared.items())
+        return heapq.nlargest(limit, (pair for pair in scored if pair[0] >= threshold))
+
+
+class TagIndex:
+    """Secondary lookups over one guild's tags and aliases
+
+    Holds titles rather than model objects so it stays valid when the guild's collections are compacted and
+    rebuilt. Maps tag id -> title, author -> titles of their tags and tag id -> titles of its aliases. The
+    :class:`TrigramIndex` over every tag and alias title in ``search`` is only built once something searches.
+    """
+    __slots__ = ("_titles", "_by_author", "_aliases", "_search")
+
+    def __init__(self, tags: typing.Iterable = (), aliases: typing.Iterable = ()):
+        self._titles: typing.Dict[int, str] = {}
+        self._by_author: typing.Dict[int, typing.Set[str]] = collections.defaultdict(set)
+        self._aliases: typing.Dict[int, typing.Set[str]] = collections.defaultdict(set)
+        self._search: typing.Optional[TrigramIndex] = None
+        for tag in tags:
+            self.add_tag(tag)
+        for alias in aliases:
+            self.add_alias(alias)
+
+    @property
+    def search(self) -> TrigramIndex:
+        if self._search is None:
+            tag_titles = (title for titles in self._by_author.values() for title in titles)
+            alias_titles = (title for titles in self._aliases.values() for title in titles)
+            self._search = TrigramIndex(itertools.chain(tag_titles, alias_titles))
+        return self._search
+
+    def add_tag(self, tag):
+        if tag.id is not None:
+            self._titles[tag.id] = tag.title
+        self._by_author[tag.author].add(tag.title)
+        if self._search is not None:
+            self._search.add(tag.title)
+
+    def remove_tag(self, tag):
+        self._titles.pop(tag.id, None)
+        if self._search is not None:
+            self._search.remove(tag.title)
+        self._discard(self._by_author, tag.author, tag.title)
+        self._aliases.pop(tag.id, None)
+
+    def change_author(self, tag, old_author: int):
+        self._discard(self._by_author, old_author, tag.title)
+        self._by_author[tag.author].add(tag.title)
+
+    def add_alias(self, alias):
+        self._aliases[alias.original].add(alias.title)
+        if self._search is not None:
+            self._search.add(alias.title)
+
+    def remove_alias(self, alias):
+        self._discard(self._aliases, alias.original, alias.title)
+        if self._search is not None:
+            self._search.remove(alias.title)
+
+    @staticmethod
+    def _discard(mapping: typing.Dict[typing.Any, typing.Set[str]], key, title: str):
+        titles = mapping.get(key)
+        if titles is not None:
+            titles.discard(title)
+            if not titles:
+                del mapping[key]
+
+    def title_of(self, tag_id: int) -> typing.Optional[str]:
+        return self._titles.get(tag_id)
+
+    def titles_by(self, author: int) -> typing.Set[str]:
+        return self._by_author.get(author, set())
+
+    def alias_titles_of(self, tag_id: int) -> typing.Set[str]:
+        return self._aliases.get(tag_id, set())
+
+    def creator_counts(self) -> typing.Counter[int]:
+        return collections.Counter({author: len(titles) for author, titles in self._by_author.items()})
@@ -0,0 +1,193 @@
+import asyncio
+import collections
+import os
+import typing
+import ujson
+
+import aiohttp
+
+from src.discord.utils.errors import BackendUnavailable
+
+
+class TelemetryPipeline:
+    """Buffers analytics records (tag calls, command calls) and ships them to the backend in bulk
+
+    Records sit in a bounded ring per endpoint and are posted as ``{"data": [...]}`` batches once a ring fills
+    up to ``FLUSH_SIZE`` or every ``FLUSH_AGE`` seconds. An endpoint that rejects the bulk envelope gets its
+    records posted one by one from then on. Records the backend rejects (4xx) are logged and dropped, batches that
+    cannot be delivered at all are appended to a local spill file, capped at ``MAX_SPILL_BYTES``, and replayed
+    after the next successful delivery.
+    """
+    MAX_BUFFER = 10000
+    FLUSH_SIZE = 250
+    FLUSH_AGE = 30
+    SEND_TIMEOUT = 10
+    MAX_SPILL_BYTES = 16 * 1024 * 1024
+    SPILL_PATH = os.path.join("data", "telemetry.spill")
+
+    __slots__ = ("_dto", "_buffers", "_wakeup", "_task", "_spill_path", "_unbatched", "sent", "spilled", "dropped",
+                 "rejected")
+
+    def __init__(self, dto, spill_path: str = None):
+        self._dto = dto
+        self._buffers: typing.Dict[str, typing.Deque[dict]] = {}
+        self._wakeup: typing.Optional[asyncio.Event] = None
+        self._task: typing.Optional[asyncio.Task] = None
+        self._spill_path = spill_path or self.SPILL_PATH
+        self._unbatched: typing.Set[str] = set()
+        self.sent = 0
+        self.spilled = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def __len__(self):
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._dto._bot.loop
+
+    @property
+    def logger(self):
+        return self._dto._bot.error_logger
+
+    def record(self, endpoint: str, payload: dict):
+        """Queues a record for ``endpoint``, never waits on the backend"""
+        buffer = self._buffers.get(endpoint)
+        if buffer is None:
+            buffer = self._buffers[endpoint] = collections.deque(maxlen=self.MAX_BUFFER)
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append(payload)
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event(loop=self.loop)
+            self._task = self.loop.create_task(self._run())
+        if len(buffer) >= self.FLUSH_SIZE:
+            self._wakeup.set()
+
+    async def _run(self):
+        while not self._dto._bot.is_closed():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.FLUSH_AGE, loop=self.loop)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _post(self, endpoint: str, body) -> typing.Optional[int]:
+        """The status of one POST, None when the backend could not be reached"""
+        try:
+            status, payload = await asyncio.wait_for(
+                self._dto.request("POST", f"{self._dto._base_url}{endpoint}", json=body),
+                self.SEND_TIMEOUT, loop=self.loop)
+        except (aiohttp.ClientError, asyncio.TimeoutError, BackendUnavailable):
+            return None
+        return status
+
+    async def _send(self, endpoint: str, batch: typing.List[dict]) -> typing.List[dict]:
+        """Delivers a batch and returns the records to try again later, none once they were sent or rejected"""
+        if endpoint not in self._unbatched:
+            status = await self._post(endpoint, {"data": batch})
+            if status is None or status >= 500:
+                return batch
+            if status in [200, 201, 204]:
+                self.sent += len(batch)
+                return []
+            self.logger.error(f"Telemetry bulk upload to {endpoint} failed with response : {status}, "
+                              f"posting records one by one")
+        for index, record in enumerate(batch):
+            status = await self._post(endpoint, record)
+            if status is None or status >= 500:
+                return batch[index:]
+            if status in [200, 201, 204]:
+                self.sent += 1
+                self._unbatched.add(endpoint)
+            else:
+                self.rejected += 1
+                self.logger.error(f"Telemetry record for {endpoint} rejected with response : {status}, dropping it")
+        return []
+
+    def _write_spill(self, lines: typing.List[str]) -> int:
+        """Appends as many lines as fit under ``MAX_SPILL_BYTES``, returns how many did"""
+        try:
+            size = os.path.getsize(self._spill_path)
+        except FileNotFoundError:
+            size = 0
+        kept = []
+        for line in lines:
+            size += len(line.encode("utf-8"))
+            if size > self.MAX_SPILL_BYTES:
+                break
+            kept.append(line)
+        if kept:
+            with open(self._spill_path, "a", encoding="utf-8") as file:
+                file.writelines(kept)
+        return len(kept)
+
+    def _take_spill(self) -> typing.List[str]:
+        replay_path = f"{self._spill_path}.replay"
+        try:
+            os.replace(self._spill_path, replay_path)
+        except FileNotFoundError:
+            return []
+        with open(replay_path, encoding="utf-8") as file:
+            lines = file.readlines()
+        os.remove(replay_path)
+        return lines
+
+    @staticmethod
+    def _spill_lines(endpoint: str, batches: typing.List[typing.List[dict]]) -> typing.List[str]:
+        return [ujson.dumps({"endpoint": endpoint, "data": batch}) + "\n" for batch in batches]
+
+    async def _spill(self, endpoint: str, batches: typing.List[typing.List[dict]]):
+        written = await self.loop.run_in_executor(None, self._write_spill, self._spill_lines(endpoint, batches))
+        self.spilled += sum(len(batch) for batch in batches[:written])
+        lost = sum(len(batch) for batch in batches[written:])
+        if lost:
+            self.dropped += lost
+            self.logger.error(f"Telemetry spill file is full, dropped {lost} records for {endpoint}")
+
+    async def _replay_spill(self):
+        lines = await self.loop.run_in_executor(None, self._take_spill)
+        for index, line in enumerate(lines):
+            try:
+                entry = ujson.loads(line)
+                endpoint, batch = entry['endpoint'], entry['data']
+            except (ValueError, KeyError, TypeError):
+                self.logger.error("Skipping an unreadable telemetry spill line")
+                continue
+            unsent = await self._send(endpoint, batch)
+            if unsent:
+                # The backend is gone again, keep this batch and everything after it for the next replay
+                remaining = self._spill_lines(endpoint, [unsent]) + lines[index + 1:]
+                await self.loop.run_in_executor(None, self._write_spill, remaining)
+                return
+
+    async def flush(self):
+        delivered = False
+        for endpoint, buffer in list(self._buffers.items()):
+            batches = []
+            while buffer:
+                batches.append([buffer.popleft() for _ in range(min(self.FLUSH_SIZE, len(buffer)))])
+            for index, batch in enumerate(batches):
+                try:
+                    unsent = await self._send(endpoint, batch)
+                except asyncio.CancelledError:
+                    self._write_spill(self._spill_lines(endpoint, batches[index:]))
+                    raise
+                if not unsent:
+                    delivered = True
+                else:
+                    await self._spill(endpoint, [unsent] + batches[index + 1:])
+                    break
+        if delivered and os.path.exists(self._spill_path):
+            await self._replay_spill()
+
+    async def drain(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
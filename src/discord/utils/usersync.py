@@ -0,0 +1,112 @@
+import array
+import asyncio
+import bisect
+import gzip
+import itertools
+import os
+import typing
+import ujson
+
+from src.discord.utils.errors import BackendUnavailable
+
+
+class UserUploader:
+    """Streams the bot's cached users to the backend at startup
+
+    Chunks are built lazily and posted ``CONCURRENCY`` at a time over the shared session. Ids that made it to the
+    backend are remembered in a sorted id file so the next startup only uploads users it has not seen before,
+    delete the file to force a full upload.
+    """
+    CHUNK_SIZE = 2000
+    CONCURRENCY = 4
+    COMPRESS_LEVEL = 6
+    IDS_PATH = os.path.join("data", "synced_users.bin")
+
+    __slots__ = ("_dto", "_compress", "_ids_path", "_known", "_synced", "uploaded", "skipped", "failed")
+
+    def __init__(self, dto, compress: bool = False, ids_path: str = None):
+        self._dto = dto
+        self._compress = compress
+        self._ids_path = ids_path or self.IDS_PATH
+        self._known = array.array("Q")
+        self._synced: typing.List[int] = []
+        self.uploaded = 0
+        self.skipped = 0
+        self.failed = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._dto._bot.loop
+
+    @property
+    def logger(self):
+        return self._dto._bot.error_logger
+
+    def _read_ids(self) -> array.array:
+        ids = array.array("Q")
+        try:
+            with open(self._ids_path, "rb") as file:
+                ids.frombytes(file.read())
+        except (FileNotFoundError, ValueError):
+            return array.array("Q")
+        return ids
+
+    def _write_ids(self, ids: array.array):
+        temp_path = f"{self._ids_path}.tmp"
+        with open(temp_path, "wb") as file:
+            ids.tofile(file)
+        os.replace(temp_path, self._ids_path)
+
+    def is_known(self, user_id: int) -> bool:
+        index = bisect.bisect_left(self._known, user_id)
+        return index < len(self._known) and self._known[index] == user_id
+
+    def _chunks(self, users: typing.Iterable) -> typing.Iterator[typing.List[int]]:
+        pending = (user.id for user in users if not self.is_known(user.id))
+        while True:
+            chunk = list(itertools.islice(pending, self.CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+    def _encode(self, chunk: typing.List[int]) -> dict:
+        body = {"data": [{"id": user_id} for user_id in chunk]}
+        if not self._compress:
+            return {"json": body}
+        return {"data": gzip.compress(ujson.dumps(body).encode(), self.COMPRESS_LEVEL),
+                "headers": {"Content-Type": "application/json", "Content-Encoding": "gzip"}}
+
+    async def _upload(self, chunk: typing.List[int]):
+        try:
+            status, response = await self._dto.request("POST", f"{self._dto._base_url}users", **self._encode(chunk))
+        except BackendUnavailable as e:
+            status, response = None, e
+        if status in [200, 201, 204]:
+            self._synced.extend(chunk)
+            self.uploaded += len(chunk)
+        else:
+            self.failed += len(chunk)
+            self.logger.error(f"User chunk upload failed with response : {status} {response}")
+
+    async def upload(self, users: typing.Collection):
+        """Uploads every user the backend has not seen yet, then records them for the next startup"""
+        self._known = await self.loop.run_in_executor(None, self._read_ids)
+        chunks = self._chunks(users)
+        # Keep a window of uploads in flight while the next chunks are still being built
+        pending = {self.loop.create_task(self._upload(chunk))
+                   for chunk in itertools.islice(chunks, self.CONCURRENCY)}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, loop=self.loop, return_when=asyncio.FIRST_COMPLETED)
+                for _ in done:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.add(self.loop.create_task(self._upload(chunk)))
+        finally:
+            for task in pending:
+                task.cancel()
+        self.skipped = len(users) - self.uploaded - self.failed
+        if self._synced:
+            merged = array.array("Q", sorted(set(itertools.chain(self._known, self._synced))))
+            await self.loop.run_in_executor(None, self._write_ids, merged)
+            self._known, self._synced = merged, []
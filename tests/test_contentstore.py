@@ -0,0 +1,73 @@
+import asyncio
+import gc
+import os
+import random
+import string
+
+from src.discord.utils.contentstore import ContentStore
+
+
+class EagerStore(ContentStore):
+    """Pages every body out on the first sweep and compacts as soon as half the page file is unused"""
+    COLD_AFTER = 0
+    PAGE_AFTER = 0
+    COMPACT_MIN = 0
+
+
+def texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(string.ascii_letters) for _ in range(2000)) for _ in range(count)]
+
+
+def sweep(store: ContentStore, times: int = 2):
+    # The first sweep compresses, the next pages out
+    loop = asyncio.new_event_loop()
+    try:
+        for _ in range(times):
+            loop.run_until_complete(store.sweep())
+    finally:
+        loop.close()
+
+
+def test_paging_in_and_out_again_reuses_the_region(tmp_path):
+    store = EagerStore(path=str(tmp_path / "pages"))
+    contents = texts(4)
+    bodies = [store.put(text) for text in contents]
+    sweep(store)
+    assert {body.state for body in bodies} == {"paged"}
+    size = os.path.getsize(store._path)
+    for _ in range(3):
+        assert [store.read(body) for body in bodies] == contents
+        sweep(store)
+        assert {body.state for body in bodies} == {"paged"}
+    assert os.path.getsize(store._path) == size == store.stats["page file"]
+    assert store.stats["compactions"] == 0
+    store.close()
+
+
+def test_regions_of_freed_bodies_are_compacted_away(tmp_path):
+    store = EagerStore(path=str(tmp_path / "pages"))
+    contents = texts(10)
+    bodies = [store.put(text) for text in contents]
+    sweep(store)
+    size = store.stats["page file"]
+    del bodies[:6]
+    gc.collect()
+    sweep(store, times=1)
+    assert store.stats["compactions"] == 1
+    assert store.stats["page file"] == os.path.getsize(store._path) < size / 2
+    assert [store.read(body) for body in bodies] == contents[6:]
+    assert not os.path.exists(store._path + ".tmp")
+    store.close()
+
+
+def test_close_keeps_paged_bodies_readable(tmp_path):
+    store = EagerStore(path=str(tmp_path / "pages"))
+    contents = texts(3)
+    bodies = [store.put(text) for text in contents]
+    sweep(store)
+    store.close()
+    assert not os.path.exists(store._path)
+    assert {body.state for body in bodies} == {"cold"}
+    assert [store.peek(body) for body in bodies] == contents
+    assert [store.read(body) for body in bodies] == contents
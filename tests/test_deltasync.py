@@ -0,0 +1,108 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.discord.utils.deltasync import ChangeFeed, DeltaSync, LocalChangeFeed
+from src.discord.utils.nextgen import Guild
+
+START = datetime.datetime(2018, 5, 1, 12, 0, 0)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def make_sync():
+    guild = Guild(None, guild=1, premium=False, welcome_message="hi",
+                  tags=[{"id": 10, "title": "rules", "content": "Be nice", "count": 3, "guild": 1},
+                        {"id": 11, "title": "faq", "content": "Read the pins", "count": 0, "guild": 1}],
+                  prefixes=[{"id": 20, "prefix": "!", "guild": 1}])
+    bot = SimpleNamespace(guild_data={1: guild})
+    feed = LocalChangeFeed()
+    return guild, feed, DeltaSync(bot, feed, since=START)
+
+
+def at(seconds: int) -> datetime.datetime:
+    return START + datetime.timedelta(seconds=seconds)
+
+
+def test_poll_applies_upserts_renames_and_deletes():
+    guild, feed, sync = make_sync()
+    feed.publish("tag", 1, {"id": 10, "title": "rules", "content": "Be very nice", "count": 7}, modified=at(1))
+    feed.publish("tag", 1, {"id": 11, "title": "help", "content": "Read the pins"}, modified=at(2))
+    feed.publish("tag", 1, {"id": 12, "title": "new", "content": "Fresh"}, modified=at(3))
+    feed.publish("prefix", 1, {"id": 20, "prefix": "!"}, action="delete", modified=at(4))
+    feed.publish("guild", 1, {"premium": True, "welcome_message": "welcome"}, modified=at(5))
+
+    assert run(sync.poll()) == 5
+    assert sync.applied == 5 and sync.ignored == 0
+    assert sync.watermark == at(5)
+    assert sorted(guild.tags) == ["help", "new", "rules"]
+    assert guild.tags["rules"].content == "Be very nice" and guild.tags["rules"].count == 7
+    assert guild.tags["help"].id == 11 and guild.tags["help"].content == "Read the pins"
+    assert guild.tags["new"].guild == 1
+    assert len(guild.prefixes) == 0
+    assert guild.premium is True and guild.welcome_message == "welcome"
+    # Nothing applied through the feed counts as a local edit waiting to be written
+    assert not guild.has_local_edits()
+
+
+def test_poll_only_applies_records_past_the_watermark():
+    guild, feed, sync = make_sync()
+    feed.publish("tag", 1, {"id": 10, "title": "rules", "count": 7}, modified=at(1))
+    assert run(sync.poll()) == 1
+    assert run(sync.poll()) == 0
+    feed.publish("tag", 1, {"id": 10, "title": "rules", "count": 9}, modified=at(2))
+    assert run(sync.poll()) == 1
+    assert guild.tags["rules"].count == 9
+    assert sync.applied == 2
+
+
+def test_records_before_the_start_overlap_are_skipped():
+    guild, feed, sync = make_sync()
+    feed.publish("tag", 1, {"id": 10, "title": "rules", "count": 7},
+                 modified=START - DeltaSync.START_OVERLAP - datetime.timedelta(seconds=1))
+    feed.publish("tag", 1, {"id": 11, "title": "faq", "count": 4}, modified=START - datetime.timedelta(seconds=1))
+    assert run(sync.poll()) == 1
+    assert guild.tags["rules"].count == 3
+    assert guild.tags["faq"].count == 4
+
+
+def test_unknown_guilds_models_and_missing_records_are_ignored():
+    guild, feed, sync = make_sync()
+    feed.publish("tag", 2, {"id": 30, "title": "other"}, modified=at(1))
+    feed.publish("webhook", 1, {"id": 31}, modified=at(2))
+    feed.publish("faq", 1, {"id": 32, "question": "why"}, action="delete", modified=at(3))
+    assert run(sync.poll()) == 0
+    assert sync.ignored == 3
+    assert sync.watermark == at(3)
+    assert sorted(guild.tags) == ["faq", "rules"]
+
+
+def test_author_changes_keep_the_tag_index_in_step():
+    guild, feed, sync = make_sync()
+    assert guild.get_tags_by_author(None) and not guild.get_tags_by_author(5)
+    index = guild.tag_index
+    feed.publish("tag", 1, {"id": 10, "title": "rules", "discord_id": 5}, modified=at(1))
+    assert run(sync.poll()) == 1
+    # An author change is applied to the built index rather than dropping it
+    assert guild.tag_index is index
+    assert [tag.title for tag in guild.get_tags_by_author(5)] == ["rules"]
+    guild.change_tag_author(guild.tags["faq"], 5)
+    assert sorted(tag.title for tag in guild.get_tags_by_author(5)) == ["faq", "rules"]
+    assert not guild.get_tags_by_author(None)
+    assert guild.tags["faq"].dirty_fields == {"author"}
+
+
+def test_a_feed_without_changes_cannot_be_created():
+    class Incomplete(ChangeFeed):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from src.discord.utils.journal import TimerJournal
+
+
+def test_replay_folds_the_log_and_continues_local_ids(tmp_path):
+    path = str(tmp_path / "timers.journal")
+    journal = TimerJournal(path=path)
+    journal.replay()
+    ids = [journal.next_id() for _ in range(3)]
+    for timer_id in ids:
+        journal.record("reminder", timer_id, {"message": str(timer_id)})
+    journal.record("reminder", ids[0], {"message": "moved"})
+    journal.forget("reminder", ids[1])
+    journal.close()
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('["+", "reminder", -9')
+
+    replayed = TimerJournal(path=path)
+    assert sorted(replayed.replay()) == [("reminder", -3, {"message": "-3"}), ("reminder", -1, {"message": "moved"})]
+    assert replayed.next_id() == -4
+    replayed.close()
+
+
+def test_local_ids_wait_for_the_replay(tmp_path):
+    journal = TimerJournal(path=str(tmp_path / "timers.journal"))
+    with pytest.raises(RuntimeError):
+        journal.next_id()
+
+    async def test():
+        waiting = asyncio.ensure_future(journal.wait_replayed())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        journal.replay()
+        await asyncio.wait_for(waiting, 1)
+        await journal.wait_replayed()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(test())
+    finally:
+        loop.close()
+    assert journal.next_id() == -1
+    journal.close()
@@ -0,0 +1,36 @@
+from src.discord.utils.nextgen import Channel, Guild, Tag
+
+
+def make_guild():
+    return Guild(None, guild=1, tags=[{"id": 1, "title": "rules", "guild": 1},
+                                      {"id": 2, "title": "faq", "content": "Read the pins", "count": 4, "guild": 1}],
+                 channels=[{"channel": 5, "guild": 1}], activities=[{"status": "Chess"}])
+
+
+def test_field_values_of_compact_records_use_field_defaults():
+    guild = make_guild()
+    assert guild.tags.field_values("count") == [0, 4]
+    assert guild.tags.field_values("edited") == [None, None]
+    assert [Tag.CONTENT_STORE.read(body) for body in guild.tags.field_values("_content")] == [None, "Read the pins"]
+    assert guild.activities.field_values("role") == [None]
+    assert not guild.activity_map
+    assert not guild.tags.materialized and not guild.activities.materialized
+
+
+def test_contains_does_not_materialize():
+    guild = make_guild()
+    assert 5 in guild.blocked_channels
+    assert 6 not in guild.blocked_channels
+    assert "rules" in guild.tags
+    assert not guild.blocked_channels.materialized and not guild.tags.materialized
+
+
+def test_contains_follows_edits_after_materializing():
+    guild = make_guild()
+    assert 7 not in guild.blocked_channels
+    del guild.blocked_channels[5]
+    guild.blocked_channels[7] = Channel(None, channel=7, guild=1)
+    assert 7 in guild.blocked_channels
+    assert 5 not in guild.blocked_channels
+    assert guild.blocked_channels.evict(0)
+    assert 7 in guild.blocked_channels and 5 not in guild.blocked_channels
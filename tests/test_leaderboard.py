@@ -0,0 +1,33 @@
+from src.discord.utils.leaderboard import Leaderboard
+
+
+def test_top_orders_by_score_then_first_to_reach_it():
+    board = Leaderboard({"a": 3, "b": 5})
+    board.add("c", 5)
+    board.add("a", 2)
+    assert board.top(3) == [("b", 5), ("c", 5), ("a", 5)]
+    assert board.total == 15
+
+
+def test_mixed_key_types_tie_without_comparing_keys():
+    # Claimed and orphaned tags write str or None authors next to the usual int ids
+    board = Leaderboard({92730223316959232: 2, "92730223316959232": 2, None: 2})
+    board.set(1, 2)
+    board.add(None)
+    board.remove("92730223316959232")
+    assert board.top(5) == [(None, 3), (92730223316959232, 2), (1, 2)]
+    assert len(board) == 3 and board.total == 7
+    assert board["92730223316959232"] == 0
+
+
+def test_remove_and_set_keep_the_order_consistent():
+    board = Leaderboard()
+    for key in range(50):
+        board.set(key, key % 5)
+    for key in range(0, 50, 3):
+        board.remove(key)
+    board.remove("missing")
+    scores = [score for _, score in board.top(len(board))]
+    assert scores == sorted(scores, reverse=True)
+    assert len(board.top(100)) == len(board) == 33
+    assert board.total == sum(key % 5 for key in range(50) if key % 3)
@@ -0,0 +1,30 @@
+from src.discord.utils.nextgen import Guild, Tag
+
+
+def make_guild(content: str = "Be nice") -> Guild:
+    return Guild(None, guild=1, tags=[{"id": 10, "title": "rules", "content": content, "count": 3, "guild": 1}])
+
+
+def test_refresh_keeps_an_unsaved_content_edit():
+    tag = Tag(None, id=10, title="rules", content="Be nice", guild=1)
+    tag.content = "Be very nice"
+    assert tag.dirty_fields == {"content"}
+    tag.refresh({"content": "remote", "count": 5})
+    assert tag.content == "Be very nice" and tag.count == 5
+
+
+def test_content_edit_survives_a_delta_sync_change():
+    guild = make_guild()
+    guild.tags["rules"].content = "Be very nice"
+    assert guild.apply_change("tag", "upsert", {"id": 10, "title": "rules", "content": "remote", "count": 7})
+    assert guild.tags["rules"].content == "Be very nice"
+    assert guild.tags["rules"].count == 7
+
+
+def test_content_edit_survives_merging_the_hydrated_guild():
+    guild = make_guild()
+    guild.tags["rules"].content = "Be very nice"
+    assert guild.has_local_edits()
+    guild.merge(make_guild(content="remote"))
+    assert guild.tags["rules"].content == "Be very nice"
+    assert guild.tags["rules"].dirty_fields == {"content"}
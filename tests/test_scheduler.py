@@ -0,0 +1,181 @@
+import asyncio
+import datetime
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.discord.utils.errors import BackendUnavailable
+from src.discord.utils.journal import TimerJournal
+from src.discord.utils.nextgen import DiscordDto
+from src.discord.utils.scheduler import TimerScheduler
+
+START = datetime.datetime(2018, 1, 1)
+
+
+def test_pop_due_fires_in_order_once_and_skips_cancelled():
+    rng = random.Random(0)
+    now = [START]
+    scheduler = TimerScheduler(clock=lambda: now[0])
+    fired = []
+
+    def timer(key, when):
+        return lambda: fired.append((when, key))
+
+    for key in range(5000):
+        when = START + datetime.timedelta(seconds=rng.randint(1, 30 * 86400))
+        scheduler.schedule(key, when, timer(key, when))
+    # Reloading the same timers must not duplicate them
+    for key in range(0, 5000, 7):
+        scheduler.schedule(key, scheduler.when(key), timer(key, scheduler.when(key)))
+    assert len(scheduler) == 5000
+    cancelled = set(rng.sample(range(5000), 500))
+    for key in cancelled:
+        assert scheduler.cancel(key)
+    assert not scheduler.cancel(next(iter(cancelled)))
+    # Moving a timer replaces it rather than adding a second one
+    moved = next(key for key in range(5000) if key not in cancelled)
+    scheduler.schedule(moved, START + datetime.timedelta(days=40), timer(moved, START + datetime.timedelta(days=40)))
+
+    while scheduler:
+        now[0] += datetime.timedelta(hours=1)
+        for callback in scheduler.pop_due():
+            callback()
+
+    keys = [key for _, key in fired]
+    assert len(keys) == len(set(keys)) == 4500
+    assert not cancelled.intersection(keys)
+    assert [when for when, _ in fired] == sorted(when for when, _ in fired)
+    assert fired[-1] == (START + datetime.timedelta(days=40), moved)
+
+
+def run(test):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(test(loop))
+    finally:
+        loop.close()
+
+
+def loop_clock(loop):
+    began = loop.time()
+    return lambda: START + datetime.timedelta(seconds=loop.time() - began)
+
+
+def test_run_task_fires_due_timers_and_wakes_for_sooner_ones():
+    async def test(loop):
+        clock = loop_clock(loop)
+        scheduler = TimerScheduler(loop, clock=clock)
+        fired = []
+        scheduler.schedule("late", clock() + datetime.timedelta(seconds=0.2), lambda: fired.append("late"))
+        scheduler.schedule("gone", clock() + datetime.timedelta(seconds=0.05), lambda: fired.append("gone"))
+        await asyncio.sleep(0.01)
+        # The task is asleep until "gone", a sooner timer has to wake it
+        scheduler.schedule("soon", clock() + datetime.timedelta(seconds=0.02), lambda: fired.append("soon"))
+        scheduler.cancel("gone")
+        scheduler.schedule("broken", clock() + datetime.timedelta(seconds=0.03), lambda: 1 / 0)
+        await asyncio.wait_for(scheduler._task, 2)
+        return fired, scheduler
+
+    fired, scheduler = run(test)
+    assert fired == ["soon", "late"]
+    assert scheduler.fired == 3 and not scheduler
+
+
+def test_stop_cancels_the_run_task():
+    async def test(loop):
+        clock = loop_clock(loop)
+        scheduler = TimerScheduler(loop, clock=clock)
+        fired = []
+        scheduler.schedule(1, clock() + datetime.timedelta(seconds=0.05), lambda: fired.append(1))
+        await asyncio.sleep(0.01)
+        scheduler.stop()
+        await asyncio.sleep(0.1)
+        return fired, scheduler
+
+    fired, scheduler = run(test)
+    assert fired == [] and scheduler._task.cancelled()
+    assert 1 in scheduler
+
+
+class StubDto(DiscordDto):
+    """Serves the reminders listing from ``pages``, a page set to None is missing on the backend"""
+
+    def __init__(self, bot, journal_path: str):
+        super().__init__(bot)
+        self._journal = TimerJournal(path=journal_path)
+        self.pages = {}
+
+    async def _get_page(self, url: str, data: dict = None):
+        return self.pages[url]
+
+
+def make_dto(tmp_path) -> StubDto:
+    bot = SimpleNamespace(config={"api_keys": {"iceteacity": "token"}}, base_url="http://backend/", loop=None,
+                          error_logger=SimpleNamespace(warning=lambda *_: None, exception=lambda *_: None))
+    return StubDto(bot, str(tmp_path / "timers.journal"))
+
+
+def reminder(rid: int, days: int = 1) -> dict:
+    return {"id": rid, "user": 1, "message": f"reminder {rid}", "channel": 2, "event": "reminder_complete",
+            "delta": (START + datetime.timedelta(days=days)).isoformat()}
+
+
+def listing(dto: StubDto, *pages):
+    urls = ["http://backend/reminders"] + [f"http://backend/reminders?page={number}" for number in range(2, 9)]
+    dto.pages = {}
+    for index, page in enumerate(pages):
+        last = index == len(pages) - 1
+        dto.pages[urls[index]] = page if page is None else \
+            {"results": page, "next": None if last else urls[index + 1]}
+
+
+def test_reminder_reload_schedules_once_and_drops_deleted_ones(tmp_path):
+    dto = make_dto(tmp_path)
+    listing(dto, [reminder(1), reminder(2)], [reminder(3)])
+    run(lambda loop: dto._sync_reminders())
+    run(lambda loop: dto._sync_reminders())
+    assert sorted(dto._reminders) == [1, 2, 3] and len(dto.timers) == 3
+    moved = dto._reminders[2]
+    listing(dto, [reminder(1), reminder(2, days=3)])
+    run(lambda loop: dto._sync_reminders())
+    assert sorted(dto._reminders) == [1, 2]
+    assert ("reminder", 3) not in dto.timers and ("reminder", 3) not in dto.journal
+    assert dto._reminders[2] is not moved
+    assert dto.timers.when(("reminder", 2)) == START + datetime.timedelta(days=3)
+
+
+def test_partial_reminder_listing_cancels_nothing(tmp_path):
+    dto = make_dto(tmp_path)
+    listing(dto, [reminder(1), reminder(2)], [reminder(3)])
+    run(lambda loop: dto._sync_reminders())
+    listing(dto, [reminder(1)], None)
+    with pytest.raises(BackendUnavailable):
+        run(lambda loop: dto._sync_reminders())
+    assert sorted(dto._reminders) == [1, 2, 3] and len(dto.timers) == 3 and len(dto.journal) == 3
+
+
+def test_reminder_poller_survives_failed_passes(tmp_path, monkeypatch):
+    dto = make_dto(tmp_path)
+    passes = []
+
+    async def sync():
+        passes.append(len(passes))
+        if len(passes) < 3:
+            raise BackendUnavailable(30) if len(passes) == 1 else ValueError("bad payload")
+
+    async def ready():
+        pass
+
+    async def no_sleep(_):
+        pass
+
+    dto._sync_reminders = sync
+    database = asyncio.Event()
+    database.set()
+    dto._bot.wait_until_ready = ready
+    dto._bot.wait_for_database = database
+    dto._bot.is_closed = lambda: len(passes) >= 3
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    run(lambda loop: dto.get_all_reminders())
+    assert passes == [0, 1, 2]
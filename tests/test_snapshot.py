@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.discord.utils.snapshot import Snapshot
+
+
+class Model:
+    def __init__(self, name: str, exported: list):
+        self.name = name
+        self._exported = exported
+
+    def to_payload(self) -> dict:
+        self._exported.append(self.name)
+        return {"name": self.name}
+
+
+def make_bot(loop, exported: list, closed=lambda: False):
+    return SimpleNamespace(loop=loop, base_url="http://backend/", is_closed=closed,
+                           guild_data={index: Model(f"guild {index}", exported) for index in range(3)},
+                           command_data={"ping": Model("ping", exported)},
+                           error_logger=SimpleNamespace(exception=lambda *_: None, warning=lambda *_: None))
+
+
+def run(test):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(test(loop))
+    finally:
+        loop.close()
+
+
+def test_save_yields_to_the_loop_between_models(tmp_path):
+    async def test(loop):
+        exported = []
+        snapshot = Snapshot(make_bot(loop, exported), path=str(tmp_path / "snapshot.bin"))
+
+        async def other():
+            exported.append("other")
+
+        save = loop.create_task(snapshot.save())
+        loop.create_task(other())
+        await save
+        return exported, await snapshot.load(), snapshot
+
+    exported, document, snapshot = run(test)
+    assert exported[0] == "guild 0" and exported.index("other") < 3
+    assert [guild["name"] for guild in document["guilds"]] == ["guild 0", "guild 1", "guild 2"]
+    assert document["commands"] == [{"name": "ping"}] and snapshot.written == 1
+
+
+def test_periodic_snapshot_survives_a_failed_save(tmp_path, monkeypatch):
+    saves = []
+
+    async def save(self):
+        saves.append(len(saves))
+        if len(saves) == 1:
+            raise OverflowError("unserialisable payload")
+
+    async def no_sleep(_):
+        pass
+
+    monkeypatch.setattr(Snapshot, "save", save)
+
+    async def test(loop):
+        snapshot = Snapshot(make_bot(loop, [], closed=lambda: len(saves) >= 2), path=str(tmp_path / "snapshot.bin"))
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+        await snapshot._run()
+
+    run(test)
+    assert saves == [0, 1]